@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+AUDITOR = os.path.join(REPO_DIR, "main_auditor.py")
+GENERATOR = os.path.join(REPO_DIR, "gen_data.py")
+BENCHMARK_JSON = "output/benchmark.json"
+
+def parse_cmd_args():
+    parser = argparse.ArgumentParser(description="端到端效能基準：生成指定規模的模組資料，並以不同 --jobs 執行完整稽核流程。")
+    parser.add_argument("--workdir", default="bench_ws", help="基準測試的工作目錄 (資料、設定與報表皆放在此)。")
+    parser.add_argument("--modules", type=int, default=1000, help="生成的模組數量。")
+    parser.add_argument("--gates", type=int, default=20, help="每份網表的 gate 組數。")
+    parser.add_argument("--netlist-mb", type=float, default=0, help="每份網表的目標大小 (MB)。")
+    parser.add_argument("--gzip-netlists", action="store_true", help="網表以 .v.gz 壓縮存放。")
+    parser.add_argument("--depth", type=int, default=0, help="巢狀目錄層數。")
+    parser.add_argument("--seed", type=int, default=0, help="資料生成的亂數種子。")
+    parser.add_argument("--jobs", default="1,2,4", help="以逗號分隔的 --jobs 值，例如 1,4,8。")
+    parser.add_argument("--repeat", type=int, default=3, help="每個 --jobs 值重複執行的次數。")
+    parser.add_argument("--skip-generate", action="store_true", help="沿用工作目錄內既有的資料，不重新生成。")
+    parser.add_argument("--audit-args", default="", help="額外傳給 main_auditor.py 的參數 (以空白分隔)。")
+    parser.add_argument("--output", default=None, help=f"結果 JSON 路徑 (預設為工作目錄下的 {BENCHMARK_JSON})。")
+    return parser.parse_args()
+
+def prepare_workspace(args):
+    os.makedirs(args.workdir, exist_ok=True)
+    if not args.skip_generate:
+        cmd = [sys.executable, GENERATOR, "--modules", str(args.modules), "--gates", str(args.gates),
+               "--netlist-mb", str(args.netlist_mb), "--depth", str(args.depth), "--seed", str(args.seed)]
+        if args.gzip_netlists:
+            cmd.append("--gzip-netlists")
+        subprocess.run(cmd, cwd=args.workdir, check=True, stdout=subprocess.DEVNULL)
+
+    # 模擬 Formality 執行檔 (與 README 的準備步驟相同)
+    tool = os.path.join(args.workdir, "bin", "formality")
+    if not os.path.exists(tool):
+        os.makedirs(os.path.dirname(tool), exist_ok=True)
+        with open(tool, 'w') as f:
+            f.write('#!/bin/bash\necho "Formality Mock Tool: Verified $2"\n')
+        os.chmod(tool, 0o755)
+
+# gen_data 把模組放在 input_data 下第 depth + 1 層
+def count_generated_modules(args):
+    level = [os.path.join(args.workdir, "input_data")]
+    for _ in range(args.depth + 1):
+        level = [e.path for d in level for e in os.scandir(d) if e.is_dir()]
+    return len(level)
+
+def run_once(args, jobs):
+    stage_file = os.path.join("output", f"bench_stages_j{jobs}.json")
+    stage_path = os.path.join(args.workdir, stage_file)
+    if os.path.exists(stage_path):
+        os.remove(stage_path)
+
+    # 搜尋深度須涵蓋巢狀層數，否則只會稽核到部分模組
+    cmd = [sys.executable, AUDITOR, "--no-cache", "--jobs", str(jobs), "--stage-report", stage_file,
+           "--max-depth", str(args.depth + 1)]
+    cmd += args.audit_args.split()
+
+    # 以 wait4 取得子程序的資源使用量 (ru_maxrss 在 Linux 為 KB)
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=args.workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, rusage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    stages = {}
+    if os.path.exists(stage_path):
+        with open(stage_path, 'r', encoding='utf-8') as f:
+            stages = json.load(f)
+
+    modules = stages.get("modules", 0)
+    peak_rss_kb = rusage.ru_maxrss if sys.platform != "darwin" else rusage.ru_maxrss // 1024
+    return {
+        "jobs": jobs,
+        "exit_code": proc.returncode,
+        "wall_s": round(wall, 4),
+        "modules": modules,
+        "modules_per_s": round(modules / wall, 2) if wall > 0 else None,
+        "peak_rss_mb": round(peak_rss_kb / 1024, 2),
+        "files_opened": stages.get("files_opened"),
+        "dir_reads": stages.get("dir_reads"),
+        "stages": stages.get("stages", {}),
+    }
+
+def summarize(runs):
+    summary = {}
+    for run in runs:
+        summary.setdefault(run["jobs"], []).append(run)
+    result = []
+    for jobs, items in sorted(summary.items()):
+        walls = sorted(r["wall_s"] for r in items)
+        median = walls[len(walls) // 2]
+        result.append({
+            "jobs": jobs,
+            "median_wall_s": median,
+            "best_wall_s": walls[0],
+            "median_modules_per_s": round(items[0]["modules"] / median, 2) if median > 0 else None,
+            "max_peak_rss_mb": max(r["peak_rss_mb"] for r in items),
+        })
+    return result
+
+def main():
+    args = parse_cmd_args()
+    prepare_workspace(args)
+    jobs_list = [int(j) for j in args.jobs.split(",") if j.strip()]
+    expected = count_generated_modules(args)
+
+    runs = []
+    for jobs in jobs_list:
+        for i in range(args.repeat):
+            run = run_once(args, jobs)
+            run["repeat"] = i
+            runs.append(run)
+            print(f"jobs={jobs} #{i + 1}: {run['wall_s']:.3f}s, {run['modules_per_s']} modules/s, "
+                  f"peak RSS {run['peak_rss_mb']} MB, 開檔 {run['files_opened']}")
+            if run["exit_code"] != 0:
+                print(f"警告: main_auditor.py 結束碼為 {run['exit_code']}")
+            if run["modules"] != expected:
+                sys.exit(f"錯誤: 稽核了 {run['modules']} 個模組，但工作目錄內有 {expected} 個，結果不具比較性 "
+                         f"(請確認 --depth 與 --audit-args)")
+
+    output = args.output or os.path.join(args.workdir, BENCHMARK_JSON)
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            "params": {
+                "modules": args.modules, "gates": args.gates, "netlist_mb": args.netlist_mb,
+                "gzip_netlists": args.gzip_netlists, "depth": args.depth, "seed": args.seed,
+                "jobs": jobs_list, "repeat": args.repeat, "audit_args": args.audit_args,
+                "cpu_count": os.cpu_count(), "python": sys.version.split()[0],
+            },
+            "summary": summarize(runs),
+            "runs": runs,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"基準結果已寫入: {output}")
+
+if __name__ == "__main__":
+    main()
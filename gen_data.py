@@ -1,14 +1,55 @@
 import os
 import json
 import csv
+import gzip
 import yaml
 import random
+import argparse
 
-def generate_project_eda_data():
-    folders = ["input_data", "config", "bin", "output"]
-    for folder in folders: 
+# 以比例決定違規的模組，違規會平均分散 (比例 1/10 即等同每第 10 個模組)
+def is_violation(index, ratio):
+    return int(index * ratio + 1e-9) != int((index - 1) * ratio + 1e-9)
+
+# 巢狀設計樹：依 fanout 把模組分配到 depth 層的子目錄 (depth=0 為平面結構)
+def module_parent_dir(root, index, depth, fanout):
+    parts = [root]
+    leaf = (index - 1) % (fanout ** depth) if depth else 0
+    for level in range(depth):
+        digit = (leaf // (fanout ** (depth - level - 1))) % fanout
+        parts.append(f"lvl{level}_{digit:02d}")
+    return os.path.join(*parts)
+
+def write_netlist(path, proj_name, n_type, mod_date, gates, netlist_mb, use_gzip):
+    header = (f"// Generated on: {mod_date}\n"
+              f"module {proj_name} (clk, rst, in, out);\n"
+              f"  // {n_type.capitalize()} Netlist for {proj_name}\n")
+    opener = (lambda p: gzip.open(p + ".gz", 'wt', compresslevel=1)) if use_gzip else (lambda p: open(p, 'w'))
+    with opener(path) as f:
+        f.write(header)
+        if netlist_mb:
+            # 大型網表以固定區塊重複寫入，避免逐行產生 GB 級資料
+            block = "".join(f"  AND2X1 g{j} (.A(n{j}), .B(n{j+1}), .Y(n{j+2}));\n"
+                            f"  DFFQX1 f{j} (.D(n{j+2}), .CK(clk), .Q(out_s{j}));\n" for j in range(2000))
+            target = int(netlist_mb * 1024 * 1024)
+            written = len(header)
+            while written < target:
+                f.write(block)
+                written += len(block)
+        else:
+            for j in range(gates):
+                f.write(f"  AND2X1 g{j} (.A(n{j}), .B(n{j+1}), .Y(n{j+2}));\n")
+                f.write(f"  DFFQX1 f{j} (.D(n{j+2}), .CK(clk), .Q(out_s{j}));\n")
+        f.write("endmodule\n")
+
+def generate_project_eda_data(modules=200, gates=20, netlist_mb=0, depth=0, fanout=4, seed=None,
+                              stale_ratio=1/10, lib_conflict_ratio=1/25, process_ratio=1/20,
+                              low_mem_ratio=1/15, bad_pdk_ratio=1/3, missing_tool_ratio=0.15,
+                              output="input_data", gzip_netlists=False):
+    rng = random.Random(seed)
+    folders = [output, "config", "bin", "output"]
+    for folder in folders:
         os.makedirs(folder, exist_ok=True)
-    
+
     # 1. Golden Spec.yaml
     target_date = "2025-05-13"
     golden_spec = {
@@ -16,59 +57,79 @@ def generate_project_eda_data():
         "release_date": target_date,
         "signoff_target": "layout_done",
         "legal_pdk_version": "v3.0",
-        "required_tools": ["VCS", "PrimeTime", "Formality", "RedHawk"]
+        "required_tools": ["VCS", "PrimeTime", "Formality", "RedHawk"],
+        # 工具資源規則：新增工具只需在此宣告，不必修改稽核程式
+        "tool_rules": {
+            "PrimeTime": {"stage": "STA", "min_memory_gb": 256, "priority": "High"},
+            "RedHawk": {"stage": "Power", "min_memory_gb": 512, "priority": "High"},
+            "Formality": {"stage": "Formal", "min_memory_gb": 64, "priority": "Medium"},
+            "VCS": {"stage": "GLS", "min_memory_gb": 128, "priority": "Low"}
+        },
+        "default_tool_rule": {"min_memory_gb": 32, "date_field": "Report_Date", "expect_date": "{release_date}"},
+        # 欄位比對規則：expect 以 {spec 欄位} 或 {module} 代入期望值
+        "status_rules": [
+            {"id": "process", "field": "process", "expect": "{process}", "message": "製程不符: 實際為 {actual}"},
+            {"id": "signoff_stage", "field": "status", "expect": "{signoff_target}", "message": "階段不符: 實際為 {actual}"},
+            {"id": "json_date", "field": "last_modified", "expect": "{release_date}", "message": "JSON 日期錯誤: {actual}"},
+            {"id": "module_name", "field": "module_name", "expect": "{module}", "message": "內部名稱衝突: {actual}"}
+        ],
+        "netlist_rules": [
+            {"id": "netlist_date", "field": "date", "expect": "{release_date}", "message": "{v_type} 網表日期過期: {actual}"},
+            {"id": "netlist_name", "field": "module", "expect": "{module}", "message": "{v_type} 網表內容名稱錯誤: {actual}"}
+        ],
+        "formal_rules": [
+            {"id": "formal_date", "field": "creation", "expect": "{release_date}", "message": "Formal 腳本日期不符: {actual}"}
+        ],
+        "setup_rules": [
+            {"id": "pdk_version", "field": "pdk_ver", "expect": "{legal_pdk_version}", "message": "PDK 版本非法: {actual}"},
+            {"id": "env_date", "field": "release", "expect": "{release_date}", "message": "全域環境日期錯誤: {actual}"}
+        ]
     }
-    with open("config/golden_spec.yaml", 'w') as f: 
-        yaml.dump(golden_spec, f, sort_keys=False)
+    with open("config/golden_spec.yaml", 'w', encoding='utf-8') as f:
+        yaml.dump(golden_spec, f, sort_keys=False, allow_unicode=True)
 
-    print(f"--- 開始生成 200 個模組資料 (規範日期: {target_date}) ---")
-    for i in range(1, 201):
-        proj_name = f"mod_{i:03d}"
-        proj_path = os.path.join("input_data", proj_name)
+    width = max(3, len(str(modules)))
+    print(f"--- 開始生成 {modules} 個模組資料 (規範日期: {target_date}) ---")
+    for i in range(1, modules + 1):
+        proj_name = f"mod_{i:0{width}d}"
+        proj_path = os.path.join(module_parent_dir(output, i, depth, fanout), proj_name)
         os.makedirs(proj_path, exist_ok=True)
 
-        current_mod_date = target_date if i % 10 != 0 else "2025-05-10"
+        current_mod_date = target_date if not is_violation(i, stale_ratio) else "2025-05-10"
 
         # 2. Netlist.v
         netlist_types = ["golden", "revised"]
-        
+
         for n_type in netlist_types:
             filename = f"{proj_name}_{n_type}.v"
-            with open(os.path.join(proj_path, filename), 'w') as f:
-                f.write(f"// Generated on: {current_mod_date}\n")
-                f.write(f"module {proj_name} (clk, rst, in, out);\n")
-                f.write(f"  // {n_type.capitalize()} Netlist for {proj_name}\n")
-                for j in range(20):
-                    f.write(f"  AND2X1 g{j} (.A(n{j}), .B(n{j+1}), .Y(n{j+2}));\n")
-                    f.write(f"  DFFQX1 f{j} (.D(n{j+2}), .CK(clk), .Q(out_s{j}));\n")
-                f.write("endmodule\n")
+            write_netlist(os.path.join(proj_path, filename), proj_name, n_type, current_mod_date,
+                          gates, netlist_mb, gzip_netlists)
 
         # 3. formal_setup.tcl
         golden_lib_v = "v3.0"
-        revised_lib_v = "v3.0" if i % 25 != 0 else "v2.0" 
+        revised_lib_v = "v3.0" if not is_violation(i, lib_conflict_ratio) else "v2.0"
 
         with open(os.path.join(proj_path, "formal_setup.tcl"), 'w') as f:
             f.write(f"# Formal Verification Setup for {proj_name}\n")
-            f.write(f"# Creation Date: {current_mod_date}\n") 
+            f.write(f"# Creation Date: {current_mod_date}\n")
             f.write(f"read_db /tools/libs/N7/{golden_lib_v}/std_cell.db\n")
             f.write(f"read_verilog -golden {proj_name}_golden.v\n")
             f.write(f"read_db /tools/libs/N7/{revised_lib_v}/std_cell.db\n")
             f.write(f"read_verilog -revised {proj_name}_revised.v\n")
 
         # 4.project_status.json
-        mod_process = "N7" if i % 20 != 0 else "N12"
+        mod_process = "N7" if not is_violation(i, process_ratio) else "N12"
         with open(os.path.join(proj_path, "project_status.json"), 'w') as f:
             json.dump({
                 "module_name": proj_name,
-                "process": mod_process,   
-                "owner": f"engineer_{random.randint(1, 10)}",
+                "process": mod_process,
+                "owner": f"engineer_{rng.randint(1, 10)}",
                 "status": "layout_done",
-                "last_modified": current_mod_date 
+                "last_modified": current_mod_date
             }, f, indent=4)
 
         # 5. setup.tcl
-        pdk_versions = ["v3.0", "v3.0", "v3.0", "v3.0", "v2.0", "v4.0"]
-        pdk_v = random.choice(pdk_versions)
+        pdk_v = rng.choice(["v2.0", "v4.0"]) if rng.random() < bad_pdk_ratio else "v3.0"
 
         with open(os.path.join(proj_path, "setup.tcl"), 'w') as f:
             f.write(f"# Environment Script (Release: {current_mod_date})\n")
@@ -79,29 +140,53 @@ def generate_project_eda_data():
         all_signoff_tools = ["VCS", "PrimeTime", "Formality", "RedHawk"]
         standard_prio = {"PrimeTime": "High", "RedHawk": "High", "Formality": "Medium", "VCS": "Low"}
         standard_mem = {"PrimeTime": "256", "RedHawk": "512", "Formality": "64", "VCS": "128"}
-        
-        prob = random.random()
-        if prob < 0.85:
-            tools_in_this_mod = all_signoff_tools 
-        elif prob < 0.95:
-            tools_in_this_mod = random.sample(all_signoff_tools, 3)
+
+        prob = rng.random()
+        if prob < 1 - missing_tool_ratio:
+            tools_in_this_mod = all_signoff_tools
+        elif prob < 1 - missing_tool_ratio / 3:
+            tools_in_this_mod = rng.sample(all_signoff_tools, 3)
         else:
-            tools_in_this_mod = random.sample(all_signoff_tools, random.randint(1, 2))
+            tools_in_this_mod = rng.sample(all_signoff_tools, rng.randint(1, 2))
 
         with open(os.path.join(proj_path, "tool_info.csv"), 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(["Tool", "Server", "Memory_GB", "Priority","Report_Date"])
-        
+
             for tool in tools_in_this_mod:
 
                 prio = standard_prio[tool]
-                mem = standard_mem[tool] if i % 15 != 0 else "8"
-                server_id = random.randint(1, 500)
+                mem = standard_mem[tool] if not is_violation(i, low_mem_ratio) else "8"
+                server_id = rng.randint(1, 500)
                 server_name = f"node_{server_id:03d}"
-                
+
                 writer.writerow([tool, server_name, mem, prio, current_mod_date])
 
-    print(f"成功！已在 input_data/ 下生成 200 個模組的 Pre-Sign-off 稽核資料。")
+    print(f"成功！已在 {output}/ 下生成 {modules} 個模組的 Pre-Sign-off 稽核資料。")
+
+def parse_cmd_args():
+    parser = argparse.ArgumentParser(description="生成模擬的 Pre-Sign-off 設計模組資料 (可調整規模以進行效能基準測試)。")
+    parser.add_argument("--modules", type=int, default=200, help="模組數量。")
+    parser.add_argument("--gates", type=int, default=20, help="每份網表的 gate 組數。")
+    parser.add_argument("--netlist-mb", type=float, default=0, help="每份網表的目標大小 (MB)，設定後取代 --gates，可達 GB 級。")
+    parser.add_argument("--gzip-netlists", action="store_true", help="網表以 .v.gz 壓縮存放。")
+    parser.add_argument("--depth", type=int, default=0, help="模組所在的巢狀目錄層數 (0 為平面結構)。")
+    parser.add_argument("--fanout", type=int, default=4, help="巢狀結構每層的子目錄數。")
+    parser.add_argument("--seed", type=int, default=None, help="亂數種子，固定後可重現相同資料。")
+    parser.add_argument("--stale-ratio", type=float, default=1/10, help="日期過期的模組比例。")
+    parser.add_argument("--lib-conflict-ratio", type=float, default=1/25, help="Formal Library 版本衝突的模組比例。")
+    parser.add_argument("--process-ratio", type=float, default=1/20, help="製程不符的模組比例。")
+    parser.add_argument("--low-mem-ratio", type=float, default=1/15, help="工具記憶體不足的模組比例。")
+    parser.add_argument("--bad-pdk-ratio", type=float, default=1/3, help="PDK 版本非法的機率。")
+    parser.add_argument("--missing-tool-ratio", type=float, default=0.15, help="工具報表缺漏的機率。")
+    parser.add_argument("--output", default="input_data", help="模組資料輸出目錄。")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    generate_project_eda_data()
\ No newline at end of file
+    args = parse_cmd_args()
+    generate_project_eda_data(
+        modules=args.modules, gates=args.gates, netlist_mb=args.netlist_mb, depth=args.depth,
+        fanout=args.fanout, seed=args.seed, stale_ratio=args.stale_ratio,
+        lib_conflict_ratio=args.lib_conflict_ratio, process_ratio=args.process_ratio,
+        low_mem_ratio=args.low_mem_ratio, bad_pdk_ratio=args.bad_pdk_ratio,
+        missing_tool_ratio=args.missing_tool_ratio, output=args.output, gzip_netlists=args.gzip_netlists)
@@ -1,16 +1,26 @@
+import time
+_STARTUP_T0 = time.perf_counter()
 import os
 import re
 import json
 import csv
-import yaml
 import logging
 import argparse
-import subprocess
-import time
 import sys
-import pandas as pd
+import signal
+import hashlib
+import gzip
+import threading
+import functools
+import io
+import queue
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from multiprocessing import Pool, cpu_count
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from fnmatch import fnmatchcase
+# pandas / yaml / multiprocessing / asyncio 於實際使用的階段才載入，--help 與小型稽核不必負擔其載入時間
+_IMPORTS_DONE = time.perf_counter()
 
 class AuditorConfig:
     PASS = "PASS"
@@ -18,9 +28,221 @@ class AuditorConfig:
     SYSTEM_ERROR = "SYSTEM_ERR"
     LOG_DIR = "output"
     REPORT_HTML = "output/final_report.html"
+    REPORT_DATA_JS = "output/final_report_data.js"
     EMAIL_LOG = "output/mail_sent.log"
     TRACE_LOG = "output/audit_trace.log"
     ERROR_CSV = "output/violation_list.csv"
+    CACHE_FILE = "output/audit_cache.json"
+    CACHE_VERSION = 3
+    CHECKPOINT_FILE = "output/audit_checkpoint.json"
+    HISTORY_DB = "output/audit_history.db"
+    DIFF_JSON = "output/audit_diff.json"
+    METRICS_JSON = "output/audit_metrics.json"
+    METRICS_PROM = "output/audit_metrics.prom"
+    PROFILE_DIR = "output/profile"
+    METRICS_TOP_N = 10
+    # 所有其他模組完成後，剩餘模組超過 --module-timeout * 2 + 此秒數仍無回應即視為卡死
+    STALL_GRACE_S = 30
+    # 各檢查單元的累計耗時與命中率，--fail-fast 據此排序 (每個單元至少累積這麼多次執行才採用)
+    RULE_STATS_JSON = "output/rule_stats.json"
+    RULE_STATS_MIN_RUNS = 20
+    # 稽核通過後要觸發的 EDA 工具 ({mod} 代入模組名稱)，timeout 為各工具的預設秒數
+    EDA_TOOLS = {
+        "formality": {"executable": "bin/formality", "args": ["-block", "{mod}", "-mode", "verify"], "timeout": 5.0}}
+    TOOL_MAX_CONCURRENCY = 4
+    TOOL_RETRIES = 1
+    TOOL_RETRY_BACKOFF = 0.5
+    # 網表表頭掃描預算：讀到這麼多位元組或行數仍未找齊欄位即停止，避免整份 GB 級網表讀進記憶體
+    HEADER_SCAN_BYTES = 4 * 1024 * 1024
+    HEADER_SCAN_LINES = 100000
+    HEADER_CHUNK_SIZE = 64 * 1024
+    HEADER_CHUNK_OVERLAP = 256
+    # 解析結果快取 (內容定址) 的 LRU 筆數上限，同一份檔案佔用 inode 與內容雜湊兩筆
+    PARSE_MEMO_ENTRIES = 4096
+    # 自適應排程：超過此大小的檔案不預讀 (交由 worker 串流讀取)，以及預讀內容佔用記憶體的預設上限
+    PREFETCH_MAX_FILE_BYTES = 1024 * 1024
+    PREFETCH_INFLIGHT_MB = 512
+
+# 網表表頭欄位 (以 bytes 比對，串流掃描時不需解碼整個區塊)
+VERILOG_HEADER_PATTERNS = {
+    "date": re.compile(rb"Generated on: (\d{4}-\d{2}-\d{2})"),
+    "module": re.compile(rb"module\s+(\w+)")}
+
+# TCL 欄位樣板 ({process} 於載入 Golden Spec 時代入製程節點)，可由 spec 的 tcl_fields 覆寫或擴充
+TCL_FIELD_TEMPLATES = {
+    "pdk_ver": r"set PDK_VER\s+(\S+)",
+    "libs": {"pattern": r"/libs/{process}/(v\d+\.\d+)/", "multiple": True},
+    "release": r"Release:\s+(\d{4}-\d{2}-\d{2})",
+    "creation": r"Creation Date:\s+(\d{4}-\d{2}-\d{2})"}
+
+# spec 未宣告規則時採用的內建預設 (與既有稽核行為一致)
+DEFAULT_TOOL_RULES = {
+    "PrimeTime": {"stage": "STA", "min_memory_gb": 256, "priority": "High"},
+    "RedHawk": {"stage": "Power", "min_memory_gb": 512, "priority": "High"},
+    "Formality": {"stage": "Formal", "min_memory_gb": 64, "priority": "Medium"},
+    "VCS": {"stage": "GLS", "min_memory_gb": 128, "priority": "Low"}}
+DEFAULT_FALLBACK_TOOL_RULE = {"min_memory_gb": 32, "date_field": "Report_Date", "expect_date": "{release_date}"}
+DEFAULT_FIELD_RULES = {
+    "status_rules": [
+        {"id": "process", "field": "process", "expect": "{process}", "message": "製程不符: 實際為 {actual}"},
+        {"id": "signoff_stage", "field": "status", "expect": "{signoff_target}", "message": "階段不符: 實際為 {actual}"},
+        {"id": "json_date", "field": "last_modified", "expect": "{release_date}", "message": "JSON 日期錯誤: {actual}"},
+        {"id": "module_name", "field": "module_name", "expect": "{module}", "message": "內部名稱衝突: {actual}"}],
+    "netlist_rules": [
+        {"id": "netlist_date", "field": "date", "expect": "{release_date}", "message": "{v_type} 網表日期過期: {actual}"},
+        {"id": "netlist_name", "field": "module", "expect": "{module}", "message": "{v_type} 網表內容名稱錯誤: {actual}"}],
+    "formal_rules": [
+        {"id": "formal_date", "field": "creation", "expect": "{release_date}", "message": "Formal 腳本日期不符: {actual}"}],
+    "setup_rules": [
+        {"id": "pdk_version", "field": "pdk_ver", "expect": "{legal_pdk_version}", "message": "PDK 版本非法: {actual}"},
+        {"id": "env_date", "field": "release", "expect": "{release_date}", "message": "全域環境日期錯誤: {actual}"}]}
+
+# 逐模組期望值 (含 {module}) 於編譯時先代入其餘 spec 欄位，稽核時只需替換這個佔位字串
+MODULE_PLACEHOLDER = "\x00module\x00"
+
+ToolRule = namedtuple("ToolRule", ["stage", "min_memory", "priority", "date_field", "expect_date", "known"])
+FieldRule = namedtuple("FieldRule", ["rule_id", "field", "expected", "per_module", "message", "severity"])
+
+# 內建檢查的訊息樣板與嚴重度 (欄位比對規則的樣板來自 Golden Spec)
+# 樣板可用 {actual}、{expected}、{field}、{subject} (網表類型、工具名稱等檢查對象)
+VIOLATION_RULES = {
+    "missing_files": ("關鍵檔案缺失: {actual}", "critical"),
+    "status_unreadable": ("project_status.json 無法讀取", "critical"),
+    "netlist_unreadable": ("無法存取 {subject} 網表檔案", "critical"),
+    "formal_libs_missing": ("Formal 腳本缺失 Library 定義", "error"),
+    "formal_lib_conflict": ("Formal 版本衝突: {actual}", "error"),
+    "formal_unreadable": ("formal_setup.tcl 無法解析", "critical"),
+    "tools_missing": ("工具報表遺失: {actual}", "error"),
+    "tool_date": ("工具 {subject} 報告日期偏差: {actual}", "warning"),
+    "tool_unknown_memory": ("未知工具 {subject} 資源配置過低", "warning"),
+    "tool_memory": ("工具 {subject} 記憶體不足: 實際僅{actual}GB", "error"),
+    "tool_priority": ("工具 {subject} 執行優先級錯誤: 目前為{actual}", "warning"),
+    "setup_unreadable": ("setup.tcl 無法讀取", "critical"),
+    "system_error": ("{actual}", "critical")}
+
+# 結構化違規紀錄：稽核時只保存規則與比對值，訊息到郵件、報表、CSV 等輸出端才格式化
+class Violation:
+    __slots__ = ("rule_id", "field", "expected", "actual", "severity", "subject")
+
+    def __init__(self, rule_id, field=None, expected=None, actual=None, severity=None, subject=None):
+        self.rule_id = rule_id
+        self.field = field
+        self.expected = expected
+        self.actual = actual
+        self.severity = severity or VIOLATION_RULES.get(rule_id, (None, "error"))[1]
+        self.subject = subject
+
+    # 以 tuple 序列化，跨 process 傳遞時不必逐筆帶上欄位名稱
+    def __reduce__(self):
+        return (Violation, self.as_tuple())
+
+    def as_tuple(self):
+        return (self.rule_id, self.field, self.expected, self.actual, self.severity, self.subject)
+
+    @classmethod
+    def from_tuple(cls, values):
+        return cls(*values)
+
+    # 歷史比對用的結構化鍵：清單類的值與順序無關，不受訊息格式影響
+    def key(self):
+        def norm(value):
+            return sorted(map(str, value)) if isinstance(value, (list, tuple, set, frozenset)) else value
+        return json.dumps([self.rule_id, self.field, self.subject, norm(self.expected), norm(self.actual)],
+                          ensure_ascii=False, default=str)
+
+    def __repr__(self):
+        return f"Violation{self.as_tuple()}"
+
+def compile_tcl_patterns(templates, process):
+    patterns, list_fields = {}, set()
+    for field, conf in templates.items():
+        if isinstance(conf, dict):
+            pattern = conf["pattern"]
+            if conf.get("multiple"):
+                list_fields.add(field)
+        else:
+            pattern = conf
+        patterns[field] = re.compile(pattern.replace("{process}", re.escape(str(process))))
+    return patterns, frozenset(list_fields)
+
+# 預設 (N7) 的 TCL 欄位，模組載入時即編譯完成
+DEFAULT_TCL_PATTERNS, DEFAULT_TCL_LIST_FIELDS = compile_tcl_patterns(TCL_FIELD_TEMPLATES, "N7")
+
+# Golden Spec 於啟動時編譯一次：工具規則為 dict 查表，欄位規則的期望值預先代入
+class CompiledAuditRules:
+    def __init__(self, spec):
+        self.spec = spec
+        self.scalars = {k: v for k, v in spec.items() if isinstance(v, (str, int, float))}
+        self.required_tools = frozenset(spec.get('required_tools') or [])
+        self.required_tools_sorted = sorted(self.required_tools)
+        fallback = dict(DEFAULT_FALLBACK_TOOL_RULE, **(spec.get('default_tool_rule') or {}))
+        self.default_tool_rule = self._compile_tool_rule(fallback, fallback, known=False)
+        self.tool_rules = {tool: self._compile_tool_rule(conf or {}, fallback, known=True)
+                           for tool, conf in (spec.get('tool_rules') or DEFAULT_TOOL_RULES).items()}
+        self.field_rules = {source: [self._compile_field_rule(r) for r in (spec.get(source) or defaults)]
+                            for source, defaults in DEFAULT_FIELD_RULES.items()}
+        templates = dict(TCL_FIELD_TEMPLATES, **(spec.get('tcl_fields') or {}))
+        self.tcl_patterns, self.tcl_list_fields = compile_tcl_patterns(templates, spec.get('process', 'N7'))
+        self.message_templates = {rule_id: template for rule_id, (template, _) in VIOLATION_RULES.items()}
+        # 本次執行的稽核計畫：fail_fast 為每個模組累積幾筆違規即停止 (0 為完整稽核)，check_order 為檢查單元順序
+        self.fail_fast = 0
+        self.check_order = AUDIT_CHECK_ORDER
+        for rules in self.field_rules.values():
+            self.message_templates.update((r.rule_id, r.message) for r in rules)
+
+    def _render(self, template, **extra):
+        if not isinstance(template, str):
+            return template
+        return template.format(**self.scalars, **extra)
+
+    def _compile_tool_rule(self, conf, fallback, known):
+        priority = conf.get("priority")
+        return ToolRule(
+            stage=conf.get("stage", ""),
+            min_memory=int(conf.get("min_memory_gb", fallback["min_memory_gb"])),
+            priority=str(priority) if priority is not None else None,
+            date_field=conf.get("date_field", fallback["date_field"]),
+            expect_date=self._render(conf.get("expect_date", fallback["expect_date"])),
+            known=known)
+
+    def _compile_field_rule(self, conf):
+        expect = conf.get("expect")
+        per_module = isinstance(expect, str) and "{module}" in expect
+        return FieldRule(
+            rule_id=conf.get("id", conf["field"]),
+            field=conf["field"],
+            expected=self._render(expect, module=MODULE_PLACEHOLDER) if per_module else self._render(expect),
+            per_module=per_module,
+            message=conf.get("message", conf["field"] + " 不符: 實際為 {actual}"),
+            severity=conf.get("severity", "error"))
+
+    def expected_value(self, rule, mod_name):
+        return rule.expected.replace(MODULE_PLACEHOLDER, mod_name) if rule.per_module else rule.expected
+
+    def tool_rule(self, tool):
+        return self.tool_rules.get(tool, self.default_tool_rule)
+
+    def format_violation(self, v):
+        template = self.message_templates.get(v.rule_id, v.rule_id + ": {actual}")
+        # v_type 為欄位規則樣板既有的佔位名稱 (網表類型)
+        return template.format(actual=v.actual, expected=v.expected, field=v.field, subject=v.subject, v_type=v.subject)
+
+    def issue_summary(self, violations):
+        return " | ".join(self.format_violation(v) for v in violations) if violations else "All Correct"
+
+# 逐模組稽核的檢查單元：預設順序即報表中違規訊息的順序；--fail-fast 以成本由低到高的順序執行
+# (目錄清單 -> JSON 純量 -> CSV -> TCL 正規表示式 -> 網表表頭)，累積足夠的統計後依 output/rule_stats.json 調整
+AUDIT_CHECK_ORDER = ("files", "status", "netlist", "formal", "tools", "setup")
+FAIL_FAST_CHECK_ORDER = ("files", "status", "tools", "setup", "formal", "netlist")
+
+# 每個模組目錄必須存在的檔案
+MUST_HAVE_FILES = frozenset({"project_status.json", "setup.tcl", "formal_setup.tcl", "tool_info.csv"})
+
+# 稽核會讀取的模組輸入檔 (增量快取以此計算指紋)
+def module_input_files(mod_name):
+    return ["project_status.json", "setup.tcl", "formal_setup.tcl", "tool_info.csv",
+            f"{mod_name}_golden.v", f"{mod_name}_revised.v",
+            f"{mod_name}_golden.v.gz", f"{mod_name}_revised.v.gz"]
 
 def init_system_logger():
     if not os.path.exists(AuditorConfig.LOG_DIR):
@@ -38,130 +260,485 @@ def init_system_logger():
     logger.addHandler(console_handler)
     return logger
 
+# 集中式日誌：worker 只把紀錄丟進佇列，由主程序的 listener 執行緒統一寫檔
+def start_log_listener(logger):
+    import logging.handlers
+    from multiprocessing import Queue
+    log_queue = Queue()
+    listener = logging.handlers.QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+    return log_queue, listener
+
+def attach_queue_logger(log_queue):
+    import logging.handlers
+    logger = logging.getLogger("IC_CAD_Auditor")
+    logger.setLevel(logging.DEBUG)
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    return logger
+
+# 函式層級量測：記錄受測函式的呼叫次數與耗時；模組稽核期間記在該模組 (執行緒) 的範圍內，隨結果回傳主程序彙總
+class FunctionMetrics:
+    def __init__(self):
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def begin_module(self):
+        self._local.scope = {}
+
+    def end_module(self):
+        scope = getattr(self._local, "scope", None)
+        self._local.scope = None
+        return scope or {}
+
+    def record(self, name, seconds):
+        scope = getattr(self._local, "scope", None)
+        if scope is not None:
+            self.add(scope, name, 1, seconds, seconds)
+        else:
+            with self._lock:
+                self.add(self.totals, name, 1, seconds, seconds)
+
+    @staticmethod
+    def add(table, name, calls, seconds, peak):
+        entry = table.get(name)
+        if entry is None:
+            table[name] = [calls, seconds, peak]
+        else:
+            entry[0] += calls
+            entry[1] += seconds
+            entry[2] = max(entry[2], peak)
+
+    @staticmethod
+    def merge(target, table):
+        for name, (calls, seconds, peak) in table.items():
+            FunctionMetrics.add(target, name, calls, seconds, peak)
+        return target
+
+FUNCTION_METRICS = FunctionMetrics()
+
+def instrumented(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                FUNCTION_METRICS.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+_MEMO_MISS = object()
+
+# 內容定址的解析結果快取：先以 (裝置, inode, 大小, mtime) 辨識同一份檔案 (硬連結、符號連結)，
+# 再以 blake2b 內容雜湊辨識由同一樣板產生的相同檔案，解析結果跨模組重用
+class ParseMemo:
+    def __init__(self):
+        self.enabled = False
+        self.max_entries = AuditorConfig.PARSE_MEMO_ENTRIES
+        self.shared = None
+        self._table = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def configure(self, conf):
+        # conf 為 None 表示停用；shared 為主程序 manager 上共享表的 proxy
+        with self._lock:
+            self._table.clear()
+        self.enabled = conf is not None
+        conf = conf or {}
+        self.max_entries = conf.get("entries") or AuditorConfig.PARSE_MEMO_ENTRIES
+        self.shared = conf.get("shared")
+
+    def _get(self, key):
+        with self._lock:
+            value = self._table.get(key, _MEMO_MISS)
+            if value is not _MEMO_MISS:
+                self._table.move_to_end(key)
+            return value
+
+    def _put(self, keys, value):
+        with self._lock:
+            for key in keys:
+                self._table[key] = value
+                self._table.move_to_end(key)
+            while len(self._table) > self.max_entries:
+                self._table.popitem(last=False)
+
+    def _shared_get(self, key):
+        found, value = self.shared.get(key)
+        return value if found else _MEMO_MISS
+
+    # 命中統計記在目前執行緒，模組稽核結束時隨 io 計數回傳主程序彙總
+    def _count(self, source):
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = {}
+        counts[source] = counts.get(source, 0) + 1
+
+    def take_counts(self):
+        counts = getattr(self._local, "counts", None)
+        self._local.counts = None
+        return counts or {}
+
+    def load(self, kind, file_path, parse):
+        st = os.stat(file_path)
+        ident = (kind, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        value = self._get(ident)
+        if value is not _MEMO_MISS:
+            self._count("inode")
+            return value
+        if self.shared is not None:
+            value = self._shared_get(ident)
+            if value is not _MEMO_MISS:
+                self._put([ident], value)
+                self._count("shared_inode")
+                return value
+
+        with open(file_path, 'rb') as f:
+            data = f.read()
+            fst = os.fstat(f.fileno())
+        # stat 與讀檔之間檔案被改寫時，不記錄 inode 對應，只以實際讀到的內容為準
+        stable = (fst.st_dev, fst.st_ino, fst.st_size, fst.st_mtime_ns) == ident[1:]
+        return self.load_data(kind, data, parse, ident if stable else None)
+
+    # 內容已由主程序預讀時只能以內容雜湊查詢
+    def load_data(self, kind, data, parse, ident=None):
+        keys = [(kind, hashlib.blake2b(data, digest_size=16).digest())]
+        if ident is not None:
+            keys.append(ident)
+
+        source = "content"
+        value = self._get(keys[0])
+        if value is _MEMO_MISS and self.shared is not None:
+            source = "shared"
+            value = self._shared_get(keys[0])
+        if value is _MEMO_MISS:
+            source = "parsed"
+            value = parse(data)
+        if self.shared is not None and source != "shared":
+            self.shared.put(keys, value)
+        self._put(keys, value)
+        self._count(source)
+        return value
+
+PARSE_MEMO = ParseMemo()
+
+# --parse-memo shared：由主程序的 manager 持有，所有 worker 共用的 LRU 表
+class SharedParseTable:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._table = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._table:
+                return False, None
+            self._table.move_to_end(key)
+            return True, self._table[key]
+
+    def put(self, keys, value):
+        with self._lock:
+            for key in keys:
+                self._table[key] = value
+                self._table.move_to_end(key)
+            while len(self._table) > self.max_entries:
+                self._table.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._table), "evictions": self.evictions}
+
+def start_shared_parse_memo(max_entries):
+    from multiprocessing.managers import BaseManager
+
+    class ParseMemoManager(BaseManager):
+        pass
+
+    ParseMemoManager.register("SharedParseTable", SharedParseTable)
+    manager = ParseMemoManager()
+    manager.start()
+    return manager, manager.SharedParseTable(max_entries)
+
+# 已讀入的 TCL 腳本：保留文字內容，欄位第一次被查詢時才擷取並記住
+class TclSettings:
+    __slots__ = ("content", "fields")
+
+    def __init__(self, content):
+        self.content = content
+        self.fields = {}
+
 class FileParsingEngine:
-    def __init__(self, logger):
+    def __init__(self, logger, scan_bytes=None, scan_lines=None, tcl_patterns=None, tcl_list_fields=None):
         self.logger = logger
+        self.tcl_patterns = tcl_patterns or DEFAULT_TCL_PATTERNS
+        self.tcl_list_fields = DEFAULT_TCL_LIST_FIELDS if tcl_list_fields is None else tcl_list_fields
+        # 欄位擷取結果與樣式綁定：快取鍵帶上樣式集合的摘要，不同 spec 共用快取表時不會互相誤用
+        signature = repr(sorted((f, p.pattern, f in self.tcl_list_fields) for f, p in self.tcl_patterns.items()))
+        self.tcl_memo_kind = "tcl:" + hashlib.blake2b(signature.encode('utf-8'), digest_size=8).hexdigest()
+        self.scan_bytes = scan_bytes or AuditorConfig.HEADER_SCAN_BYTES
+        self.scan_lines = scan_lines or AuditorConfig.HEADER_SCAN_LINES
 
-    def parse_verilog_header(self, file_path):
-        if not os.path.exists(file_path):
-            return None
+    @instrumented("parse_verilog_header")
+    def parse_verilog_header(self, file_path, data=None):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                date_ptrn = r"Generated on: (\d{4}-\d{2}-\d{2})"
-                mod_ptrn = r"module\s+(\w+)"
-                date_res = re.search(date_ptrn, content)
-                mod_res = re.search(mod_ptrn, content)
-                return {
-                    "date": date_res.group(1) if date_res else "NOT_FOUND",
-                    "module": mod_res.group(1) if mod_res else "NOT_FOUND",
-                    "size": os.path.getsize(file_path)}
+            if data is not None:
+                # 主程序已預讀整份網表 (只預讀小檔)，直接在記憶體內掃描
+                raw = io.BytesIO(data)
+                f = gzip.GzipFile(fileobj=raw) if file_path.endswith(".gz") else raw
+                found = self._scan_header(f)
+                size = len(data)
+            else:
+                opener = gzip.open if file_path.endswith(".gz") else open
+                with opener(file_path, 'rb') as f:
+                    found = self._scan_header(f)
+                    size = os.fstat(f.fileno()).st_size
+            return {
+                "date": found.get("date", "NOT_FOUND"),
+                "module": found.get("module", "NOT_FOUND"),
+                "size": size}
+        except FileNotFoundError:
+            return None
         except Exception as e:
             self.logger.error(f"解析 Verilog 失敗: {file_path} -> {e}")
             return None
 
-    def parse_tcl_settings(self, file_path):
-        if not os.path.exists(file_path): return {}
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return {
-                    "pdk_ver": self._safe_regex(r"set PDK_VER\s+(\S+)", content),
-                    "libs": re.findall(r"/libs/N7/(v\d+\.\d+)/", content),
-                    "release": self._safe_regex(r"Release:\s+(\d{4}-\d{2}-\d{2})", content),
-                    "creation": self._safe_regex(r"Creation Date:\s+(\d{4}-\d{2}-\d{2})", content)
-                }
+    def _scan_header(self, f):
+        # 分塊串流讀取，兩個欄位都找到或超過預算即停止；gzip 也只解壓到需要的位置
+        found = {}
+        tail = b""
+        read_bytes = 0
+        read_lines = 0
+        while len(found) < len(VERILOG_HEADER_PATTERNS):
+            chunk = f.read(AuditorConfig.HEADER_CHUNK_SIZE)
+            read_bytes += len(chunk)
+            read_lines += chunk.count(b"\n")
+            exhausted = not chunk or read_bytes >= self.scan_bytes or read_lines >= self.scan_lines
+            window = tail + chunk
+            for key, ptrn in VERILOG_HEADER_PATTERNS.items():
+                if key in found:
+                    continue
+                match = ptrn.search(window)
+                # 命中結果貼齊區塊尾端時可能被截斷，保留到下一塊再確認
+                if match and (match.end() < len(window) or exhausted):
+                    found[key] = match.group(1).decode('utf-8', errors='replace')
+            if exhausted:
+                break
+            tail = window[-AuditorConfig.HEADER_CHUNK_OVERLAP:]
+        return found
+
+    def _read_parsed(self, kind, file_path, parse, data=None):
+        if data is not None:
+            return PARSE_MEMO.load_data(kind, data, parse) if PARSE_MEMO.enabled else parse(data)
+        if PARSE_MEMO.enabled:
+            return PARSE_MEMO.load(kind, file_path, parse)
+        with open(file_path, 'rb') as f:
+            return parse(f.read())
+
+    @instrumented("extract_tcl_field")
+    def extract_tcl_field(self, content, field):
+        ptrn = self.tcl_patterns[field]
+        if field in self.tcl_list_fields:
+            return ptrn.findall(content)
+        return self._safe_regex(ptrn, content)
+
+    # 讀入 TCL 腳本，讀不到時回傳 None；欄位由 tcl_field 依需要擷取，內容相同的腳本沿用同一份擷取結果
+    @instrumented("parse_tcl_settings")
+    def parse_tcl_settings(self, file_path, data=None):
+        try:
+            return self._read_parsed(self.tcl_memo_kind, file_path, lambda raw: TclSettings(raw.decode('utf-8')), data)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             self.logger.error(f"tcl 讀取異常: {file_path} -> {e}")
-            return {}
+            return None
+
+    def tcl_field(self, settings, field):
+        value = settings.fields.get(field, _MEMO_MISS)
+        if value is _MEMO_MISS:
+            value = settings.fields[field] = self.extract_tcl_field(settings.content, field)
+        return value
 
     def _safe_regex(self, pattern, text):
-        match = re.search(pattern, text)
+        match = pattern.search(text)
         return match.group(1) if match else "MISSING"
 
-    def read_json_safe(self, file_path):
-        if not os.path.exists(file_path):
-            return None
+    @instrumented("read_json_safe")
+    def read_json_safe(self, file_path, data=None):
         try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
+            return self._read_parsed("json", file_path, json.loads, data)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             self.logger.error(f"JSON 讀取異常: {file_path} -> {e}")
             return None
 
-    def read_csv_safe(self, file_path):
-        if not os.path.exists(file_path):
-            return []
+    @instrumented("read_csv_safe")
+    def read_csv_safe(self, file_path, data=None):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return list(csv.DictReader(f))
+            return self._read_parsed("csv", file_path, lambda raw: list(csv.DictReader(io.StringIO(raw.decode('utf-8'), newline=None))), data)
+        except FileNotFoundError:
+            return []
         except Exception as e:
             self.logger.error(f"CSV 讀取異常: {file_path} -> {e}")
             return []
 
+# 單一模組的檔案集合：每個檔案最多開啟一次，欄位依稽核規則需要時才擷取
+class ModuleArtifacts:
+    def __init__(self, mod_dir, parser, listing=None, prefetched=None):
+        self.mod_dir = mod_dir
+        self.mod_name = os.path.basename(mod_dir)
+        self.parser = parser
+        self._listing = listing
+        self._prefetched = prefetched or {}
+        self._loaded = {}
+        self.open_count = 0
+        self.stat_count = 0
+        self.load_seconds = 0.0
+
+    def listing(self):
+        if self._listing is None:
+            self.stat_count += 1
+            try:
+                self._listing = frozenset(os.listdir(self.mod_dir))
+            except OSError as e:
+                self.parser.logger.error(f"模組目錄讀取異常: {self.mod_dir} -> {e}")
+                self._listing = frozenset()
+        return self._listing
+
+    def _load(self, name, loader, missing=None):
+        if name not in self._loaded:
+            # 以目錄清單判斷存在性，不存在的檔案不必再 stat/open
+            if name in self.listing():
+                self.open_count += 1
+                start = time.perf_counter()
+                path = os.path.join(self.mod_dir, name)
+                data = self._prefetched.get(name)
+                self._loaded[name] = loader(path) if data is None else loader(path, data)
+                self.load_seconds += time.perf_counter() - start
+            else:
+                self._loaded[name] = missing
+        return self._loaded[name]
+
+    def status_json(self):
+        return self._load("project_status.json", self.parser.read_json_safe)
+
+    def tool_rows(self):
+        return self._load("tool_info.csv", self.parser.read_csv_safe, missing=[])
+
+    def tcl_settings(self, name):
+        return self._load(name, self.parser.parse_tcl_settings)
+
+    def tcl_field(self, name, field):
+        settings = self.tcl_settings(name)
+        return None if settings is None else self.parser.tcl_field(settings, field)
+
+    def netlist_name(self, v_type):
+        name = f"{self.mod_name}_{v_type}.v"
+        if name not in self.listing() and f"{name}.gz" in self.listing():
+            return f"{name}.gz"
+        return name
+
+    def netlist_header(self, v_type):
+        return self._load(self.netlist_name(v_type), self.parser.parse_verilog_header)
+
+    def io_counts(self):
+        counts = {"opens": self.open_count, "stats": self.stat_count, "load_s": self.load_seconds}
+        if PARSE_MEMO.enabled:
+            # 以 inode 命中的檔案不必開檔
+            memo = PARSE_MEMO.take_counts()
+            counts["opens"] -= memo.get("inode", 0) + memo.get("shared_inode", 0)
+            counts["memo"] = memo
+        return counts
+
 class SignoffAuditManager:
-    def __init__(self, spec, logger):
-        self.spec = spec
+    def __init__(self, rules, logger):
+        self.rules = rules
+        self.spec = rules.spec
         self.logger = logger
-        self.parser = FileParsingEngine(logger)
-
-    def audit_environment(self, mod_dir, mod_name, errors):
-        # 1. 檔案存在性
-        must_have = {"project_status.json", "setup.tcl", "formal_setup.tcl", "tool_info.csv"}
-        current_files = set(os.listdir(mod_dir))
-        if not must_have.issubset(current_files):
-            missing = must_have - current_files
-            errors.append(f"關鍵檔案缺失: {list(missing)}")
-        
-        # 2. JSON 內容細節校驗
-        js_data = self.parser.read_json_safe(os.path.join(mod_dir, "project_status.json"))
+        self.parser = FileParsingEngine(logger, tcl_patterns=rules.tcl_patterns, tcl_list_fields=rules.tcl_list_fields)
+
+    def load_module(self, mod_dir, listing=None, prefetched=None):
+        return ModuleArtifacts(mod_dir, self.parser, listing, prefetched)
+
+    def _check_fields(self, source, get_value, mod_name, errors, subject=None):
+        for rule in self.rules.field_rules[source]:
+            actual = get_value(rule.field)
+            expected = self.rules.expected_value(rule, mod_name)
+            if actual != expected:
+                errors.append(Violation(rule.rule_id, rule.field, expected, actual, rule.severity, subject))
+
+    def run_checks(self, art, errors, order=AUDIT_CHECK_ORDER, fail_fast=0):
+        # 依序執行檢查單元並記錄哪些單元抓到違規；fail_fast 模式累積足夠違規即停止，後續檔案不必開啟
+        ran, hits = [], []
+        for check in order:
+            before = len(errors)
+            getattr(self, f"check_{check}")(art, errors)
+            ran.append(check)
+            if len(errors) > before:
+                hits.append(check)
+                if fail_fast and len(errors) >= fail_fast:
+                    break
+        if fail_fast:
+            del errors[fail_fast:]
+        return ran, hits
+
+    # 1. 檔案存在性
+    @instrumented("check_files")
+    def check_files(self, art, errors):
+        current_files = art.listing()
+        if not MUST_HAVE_FILES.issubset(current_files):
+            missing = MUST_HAVE_FILES - current_files
+            errors.append(Violation("missing_files", actual=sorted(missing)))
+
+    # 2. JSON 內容細節校驗
+    @instrumented("check_status")
+    def check_status(self, art, errors):
+        js_data = art.status_json()
         if js_data:
-            if js_data.get("process") != self.spec['process']:
-                errors.append(f"製程不符: 實際為 {js_data.get('process')}")
-            if js_data.get("status") != self.spec['signoff_target']:
-                errors.append(f"階段不符: 實際為 {js_data.get('status')}")
-            if js_data.get("last_modified") != self.spec['release_date']:
-                errors.append(f"JSON 日期錯誤: {js_data.get('last_modified')}")
-            if js_data.get("module_name") != mod_name:
-                errors.append(f"內部名稱衝突: {js_data.get('module_name')}")
+            self._check_fields("status_rules", js_data.get, art.mod_name, errors)
         else:
-            errors.append("project_status.json 無法讀取")
+            errors.append(Violation("status_unreadable", field="project_status.json"))
 
-    def audit_formal_logic(self, mod_dir, mod_name, errors):
-        # 1. 兩份網表的日期與命名檢查
+    # 3. 兩份網表的日期與命名檢查
+    @instrumented("check_netlist")
+    def check_netlist(self, art, errors):
         for v_type in ["golden", "revised"]:
-            path = os.path.join(mod_dir, f"{mod_name}_{v_type}.v")
-            v_info = self.parser.parse_verilog_header(path)
+            v_info = art.netlist_header(v_type)
             if not v_info:
-                errors.append(f"無法存取 {v_type} 網表檔案")
+                errors.append(Violation("netlist_unreadable", subject=v_type))
             else:
-                if v_info.get('date') != self.spec['release_date']:
-                    errors.append(f"{v_type} 網表日期過期: {v_info.get('date')}")
-                if v_info.get('module') != mod_name:
-                    errors.append(f"{v_type} 網表內容名稱錯誤: {v_info.get('module')}")
-
-        # 2. LEC Library 版本對齊
-        tcl_data = self.parser.parse_tcl_settings(os.path.join(mod_dir, "formal_setup.tcl"))
-        if tcl_data:
-            libs = tcl_data.get("libs", [])
+                self._check_fields("netlist_rules", v_info.get, art.mod_name, errors, subject=v_type)
+
+    # 4. LEC Library 版本對齊
+    @instrumented("check_formal")
+    def check_formal(self, art, errors):
+        if art.tcl_settings("formal_setup.tcl") is not None:
+            libs = art.tcl_field("formal_setup.tcl", "libs")
             if len(libs) < 2:
-                errors.append("Formal 腳本缺失 Library 定義")
+                errors.append(Violation("formal_libs_missing", field="libs", actual=libs))
             elif len(set(libs)) > 1:
-                errors.append(f"Formal 版本衝突: {libs}")
-            if tcl_data.get("creation") != self.spec['release_date']:
-                errors.append(f"Formal 腳本日期不符: {tcl_data.get('creation')}")
+                errors.append(Violation("formal_lib_conflict", field="libs", actual=libs))
+            self._check_fields("formal_rules", lambda f: art.tcl_field("formal_setup.tcl", f), art.mod_name, errors)
         else:
-            errors.append("formal_setup.tcl 無法解析")
+            errors.append(Violation("formal_unreadable", field="formal_setup.tcl"))
 
-    def audit_resources_and_tools(self, mod_dir, errors):
-        # 1. 工具完整性
-        rows = self.parser.read_csv_safe(os.path.join(mod_dir, "tool_info.csv"))
+    # 5. 工具完整性與各階段資源配置
+    @instrumented("check_tools")
+    def check_tools(self, art, errors):
+        rows = art.tool_rows()
         present_tools = {r['Tool'] for r in rows if r['Tool']}
-        required = set(self.spec['required_tools'])
+        required = self.rules.required_tools
         if not required.issubset(present_tools):
-            errors.append(f"工具報表遺失: {list(required - present_tools)}")
+            errors.append(Violation("tools_missing", field="Tool", expected=self.rules.required_tools_sorted, actual=sorted(required - present_tools)))
 
-        # 2. 各階段工具細節
+        # 各階段工具細節 (規則以工具名稱查表)
         for r in rows:
             try:
                 mem_str = r.get('Memory_GB', '0')
@@ -171,42 +748,37 @@ class SignoffAuditManager:
             
             tool = r.get('Tool')
             prio = r.get('Priority')
-            date = r.get('Report_Date')
-
-            if date != self.spec['release_date']:
-                errors.append(f"工具 {tool} 報告日期偏差: {date}")
-
-            if tool == "PrimeTime":
-                if mem < 256: errors.append(f"工具 {tool} STA 記憶體不足: 實際僅{mem}GB")
-                if prio != "High": errors.append(f"工具 {tool} 執行優先級錯誤: 目前為{prio}")
-            elif tool == "RedHawk":
-                if mem < 512: errors.append(f"工具 {tool} Power 記憶體不足: 實際僅{mem}GB")
-                if prio != "High": errors.append(f"工具 {tool} 執行優先級錯誤: 目前為{prio}")
-            elif tool == "Formality":
-                if mem < 64: errors.append(f"工具 {tool} Formal 記憶體不足: 實際僅{mem}GB")
-                if prio != "Medium": errors.append(f"工具 {tool} 執行優先級錯誤: 目前為{prio}")
-            elif tool == "VCS":
-                if mem < 128: errors.append(f"工具 {tool} GLS 記憶體不足: 實際僅{mem}GB")
-                if prio != "Low": errors.append(f"工具 {tool} 執行優先級錯誤: 目前為{prio}")
-            else:
-                if mem < 32: errors.append(f"未知工具 {tool} 資源配置過低")
-
-    def audit_pdk_consistency(self, mod_dir, errors):
-        setup_data = self.parser.parse_tcl_settings(os.path.join(mod_dir, "setup.tcl"))
-        if setup_data:
-            if setup_data.get("pdk_ver") != self.spec['legal_pdk_version']:
-                errors.append(f"PDK 版本非法: {setup_data.get('pdk_ver')}")
-            if setup_data.get("release") != self.spec['release_date']:
-                errors.append(f"全域環境日期錯誤: {setup_data.get('release')}")
+            rule = self.rules.tool_rule(tool)
+            date = r.get(rule.date_field)
+
+            if date != rule.expect_date:
+                errors.append(Violation("tool_date", rule.date_field, rule.expect_date, date, subject=tool))
+
+            if not rule.known:
+                if mem < rule.min_memory: errors.append(Violation("tool_unknown_memory", "Memory_GB", rule.min_memory, mem, subject=tool))
+                continue
+            if mem < rule.min_memory: errors.append(Violation("tool_memory", "Memory_GB", rule.min_memory, mem, subject=f"{tool} {rule.stage}"))
+            if rule.priority is not None and prio != rule.priority: errors.append(Violation("tool_priority", "Priority", rule.priority, prio, subject=tool))
+
+    # 6. PDK 版本與全域環境
+    @instrumented("check_setup")
+    def check_setup(self, art, errors):
+        if art.tcl_settings("setup.tcl") is not None:
+            self._check_fields("setup_rules", lambda f: art.tcl_field("setup.tcl", f), art.mod_name, errors)
         else:
-            errors.append("setup.tcl 無法讀取")
+            errors.append(Violation("setup_unreadable", field="setup.tcl"))
 
+# 通知彙整：由主程序單一寫入，同一負責人的失敗模組合併成一封摘要信
 class AuditActionTrigger:
-    def __init__(self, logger):
+    def __init__(self, logger, rules):
         self.logger = logger
+        self.rules = rules
+        self.pending = {}
 
-    def notify_owner_simulation(self, mod_id, owner, errors):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def queue_notification(self, mod_id, owner, violations):
+        self.pending.setdefault(owner, []).append((mod_id, violations))
+
+    def build_owner_digest(self, owner, blocks, timestamp):
         mail_text = f"""
 ==================================================
 NOTIFICATION: PRE-SIGN-OFF AUDIT FAILED
@@ -214,74 +786,1329 @@ NOTIFICATION: PRE-SIGN-OFF AUDIT FAILED
 TIME: {timestamp}
 RECIPIENT: {owner}@design.com
 CC: manager@design.com
-BLOCK_ID: {mod_id}
-VIOLATIONS DETECTED:
+FAILED_BLOCKS: {len(blocks)}
 """
-        for i, err in enumerate(errors, 1):
-            mail_text += f"\n  [{i}] {err}"
-        mail_text += "\n\nSTATUS: BLOCK REJECTED FROM TAPE-OUT FLOW.\n"
+        for mod_id, violations in sorted(blocks, key=lambda b: b[0]):
+            mail_text += f"\nBLOCK_ID: {mod_id}\nVIOLATIONS DETECTED:"
+            for i, v in enumerate(violations, 1):
+                mail_text += f"\n  [{i}] {self.rules.format_violation(v)}"
+            mail_text += "\n"
+        mail_text += "\nSTATUS: BLOCKS REJECTED FROM TAPE-OUT FLOW.\n"
         mail_text += "==================================================\n\n\n"
-        
+        return mail_text
+
+    def flush_notifications(self):
+        if not self.pending:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        digests = [self.build_owner_digest(owner, blocks, timestamp) for owner, blocks in sorted(self.pending.items())]
         try:
             with open(AuditorConfig.EMAIL_LOG, 'a', encoding='utf-8') as f:
-                f.write(mail_text)
-            self.logger.warning(f"模組 {mod_id}: 稽核失敗，已將錯誤報告發送至 {owner} 郵箱")
+                f.write("".join(digests))
+            for owner, blocks in sorted(self.pending.items()):
+                self.logger.warning(f"已將 {len(blocks)} 個稽核失敗模組彙整為摘要信發送至 {owner} 郵箱")
         except Exception as e:
             self.logger.error(f"郵件日誌寫入失敗: {e}")
+        self.pending = {}
 
-    def trigger_mock_eda_tool(self, mod_id):
-        tool_executable = os.path.abspath("bin/formality")
-        if not os.path.exists(tool_executable):
-            self.logger.error(f"模組 {mod_id}: 找不到執行檔 {tool_executable}")
-            return
+# 工具啟動階段：稽核結束後統一以 asyncio 子程序啟動，受 license 座位數限制並支援重試
+class EdaToolLauncher:
+    def __init__(self, logger, max_concurrency=None, retries=None, backoff=None, timeouts=None):
+        self.logger = logger
+        self.max_concurrency = max(1, max_concurrency or AuditorConfig.TOOL_MAX_CONCURRENCY)
+        self.retries = AuditorConfig.TOOL_RETRIES if retries is None else retries
+        self.backoff = AuditorConfig.TOOL_RETRY_BACKOFF if backoff is None else backoff
+        self.tools = {}
+        for name, conf in AuditorConfig.EDA_TOOLS.items():
+            self.tools[name] = dict(conf, executable=os.path.abspath(conf["executable"]),
+                                    timeout=(timeouts or {}).get(name, conf["timeout"]))
+        # 環境變數只複製一次，所有子程序共用
+        self.env_vars = os.environ.copy()
+        self.env_vars["AUDIT_PASS"] = "1"
+
+    def launch_all(self, mod_ids):
+        import asyncio
+        if not mod_ids:
+            return {}
+        return asyncio.run(self._launch_all(mod_ids))
+
+    async def _launch_all(self, mod_ids):
+        import asyncio
+        queue = asyncio.Queue()
+        for mod_id in mod_ids:
+            for tool in self.tools:
+                queue.put_nowait((mod_id, tool))
+        records = {}
+        consumers = [asyncio.create_task(self._consume(queue, records))
+                     for _ in range(min(self.max_concurrency, queue.qsize()))]
+        await queue.join()
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        return records
+
+    async def _consume(self, queue, records):
+        while True:
+            mod_id, tool = await queue.get()
+            try:
+                records.setdefault(mod_id, {})[tool] = await self._launch_with_retry(mod_id, tool)
+            finally:
+                queue.task_done()
+
+    async def _launch_with_retry(self, mod_id, tool):
+        import asyncio
+        for attempt in range(1, self.retries + 2):
+            start = time.perf_counter()
+            record = await self._launch_once(mod_id, tool)
+            FUNCTION_METRICS.record("launch_eda_tool", time.perf_counter() - start)
+            if record["exit_status"] == 0 or record["exit_status"] == "NOT_FOUND":
+                break
+            if attempt <= self.retries:
+                delay = self.backoff * (2 ** (attempt - 1))
+                self.logger.warning(f"模組 {mod_id}: {tool} 啟動失敗 ({record['exit_status']})，{delay:.1f}s 後重試")
+                await asyncio.sleep(delay)
+        record["attempts"] = attempt
+        return record
+
+    async def _launch_once(self, mod_id, tool):
+        import asyncio
+        conf = self.tools[tool]
+        start = time.monotonic()
+        if not os.path.exists(conf["executable"]):
+            self.logger.error(f"模組 {mod_id}: 找不到執行檔 {conf['executable']}")
+            return {"exit_status": "NOT_FOUND", "latency": 0.0}
+        cmd_args = [arg.format(mod=mod_id) for arg in conf["args"]]
         try:
-            env_vars = os.environ.copy()
-            env_vars["AUDIT_PASS"] = "1"
-            result = subprocess.run(
-                [tool_executable, "-block", mod_id, "-mode", "verify"],
-                capture_output=True, text=True, timeout=5, env=env_vars)
-            if result.returncode == 0:
-                self.logger.info(f"模組 {mod_id}: 稽核通過，成功觸發工具執行: {result.stdout.strip()}")
-            else:
-                self.logger.error(f"模組 {mod_id}: 工具啟動回傳異常代碼")
-        except subprocess.SubprocessError as e:
+            proc = await asyncio.create_subprocess_exec(
+                conf["executable"], *cmd_args,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, env=self.env_vars,
+                start_new_session=hasattr(os, "killpg"))
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=conf["timeout"])
+            except asyncio.TimeoutError:
+                # 工具常以 wrapper script 再衍生子程序，需整個 process group 一起終止
+                if hasattr(os, "killpg"):
+                    try:
+                        os.killpg(proc.pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                else:
+                    proc.kill()
+                await proc.wait()
+                self.logger.error(f"模組 {mod_id}: {tool} 執行逾時 (>{conf['timeout']}s)")
+                return {"exit_status": "TIMEOUT", "latency": round(time.monotonic() - start, 3)}
+        except OSError as e:
             self.logger.error(f"模組 {mod_id}: 動態啟動發生系統級錯誤: {e}")
+            return {"exit_status": "LAUNCH_ERR", "latency": round(time.monotonic() - start, 3)}
+
+        latency = round(time.monotonic() - start, 3)
+        if proc.returncode == 0:
+            self.logger.info(f"模組 {mod_id}: 稽核通過，成功觸發工具執行: {stdout.decode('utf-8', errors='replace').strip()}")
+        else:
+            self.logger.error(f"模組 {mod_id}: 工具啟動回傳異常代碼 {proc.returncode}")
+        return {"exit_status": proc.returncode, "latency": latency}
+
+# 模組探索：以 os.scandir 多執行緒遞迴掃描設計樹，同時取得每個模組的檔案清單供稽核重用
+class ModuleDiscovery:
+    def __init__(self, root, logger, include=None, exclude=None, max_depth=1, threads=16):
+        self.root = root
+        self.logger = logger
+        self.include = include or ["mod_*"]
+        self.exclude = exclude or []
+        self.max_depth = max_depth
+        self.threads = max(1, threads)
+        self.dirs_scanned = 0
+        self.tree_dirs = []
+
+    def _match(self, name, patterns):
+        return any(fnmatchcase(name, p) for p in patterns)
+
+    def _scan_dir(self, path, depth):
+        modules, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if not entry.is_dir() or self._match(entry.name, self.exclude):
+                        continue
+                    if self._match(entry.name, self.include):
+                        modules.append(entry.path)
+                    # 不跟隨目錄的 symlink 向下展開，避免循環
+                    elif (not self.max_depth or depth < self.max_depth) and not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError as e:
+            self.logger.error(f"目錄掃描失敗: {path} -> {e}")
+        return modules, subdirs, depth, path
+
+    def list_module(self, path):
+        try:
+            with os.scandir(path) as it:
+                return path, frozenset(entry.name for entry in it)
+        except OSError as e:
+            self.logger.error(f"模組目錄讀取異常: {path} -> {e}")
+            return path, None
+
+    def discover(self):
+        found = []
+        self.dirs_scanned = 0
+        self.tree_dirs = []
+        with ThreadPoolExecutor(max_workers=self.threads) as executor:
+            pending = {executor.submit(self._scan_dir, self.root, 1)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    result = fut.result()
+                    if len(result) == 2:
+                        found.append(result)
+                        continue
+                    modules, subdirs, depth, path = result
+                    self.dirs_scanned += 1
+                    self.tree_dirs.append(path)
+                    pending.update(executor.submit(self.list_module, m) for m in modules)
+                    pending.update(executor.submit(self._scan_dir, d, depth + 1) for d in subdirs)
+        found.sort()
+        return found
+
+# 監看模式的檔案變動偵測：回傳受影響的模組目錄，以及設計樹結構是否改變 (需重新探索)
+class TreeWatcher:
+    def __init__(self, logger):
+        self.logger = logger
+        self.tree_dirs = set()
+        self.module_dirs = {}
+
+    def reset(self, tree_dirs, module_dirs):
+        self.tree_dirs = set(tree_dirs)
+        # 只有稽核會讀取的檔案才算變動，編輯器的暫存檔 (.swp、~) 不會觸發重新稽核
+        self.module_dirs = {d: frozenset(module_input_files(os.path.basename(d))) for d in module_dirs}
+
+    def poll(self, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+# Linux inotify (以 ctypes 呼叫 libc)，每個目錄一個 watch，事件直接對應到模組
+class InotifyTreeWatcher(TreeWatcher):
+    IN_CLOSE_WRITE = 0x00000008
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+                  | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    def __init__(self, logger):
+        super().__init__(logger)
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 失敗")
+        self.watches = {}
+
+    def reset(self, tree_dirs, module_dirs):
+        super().reset(tree_dirs, module_dirs)
+        wanted = self.tree_dirs | set(self.module_dirs)
+        for wd, path in list(self.watches.items()):
+            if path not in wanted:
+                self._libc.inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+        watched = set(self.watches.values())
+        for path in wanted - watched:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), self.WATCH_MASK)
+            if wd < 0:
+                err = self._ctypes.get_errno()
+                # watch 數量超過 fs.inotify.max_user_watches 時由呼叫端改用輪詢
+                raise OSError(err, f"inotify_add_watch 失敗: {path} ({os.strerror(err)})")
+            self.watches[wd] = path
+
+    def poll(self, timeout):
+        import select
+        import struct
+        dirty, rescan = set(), False
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return dirty, rescan
+        try:
+            buf = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return dirty, rescan
+        offset = 0
+        while offset + 16 <= len(buf):
+            wd, mask, _, length = struct.unpack_from("iIII", buf, offset)
+            name = os.fsdecode(buf[offset + 16:offset + 16 + length].rstrip(b"\0"))
+            offset += 16 + length
+            if mask & self.IN_Q_OVERFLOW:
+                # 事件佇列溢位時無法得知哪些模組變動，重新探索並全部重新稽核
+                dirty.update(self.module_dirs)
+                rescan = True
+                continue
+            path = self.watches.get(wd)
+            if path is None:
+                continue
+            if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                rescan = True
+            elif path in self.module_dirs:
+                if name in self.module_dirs[path]:
+                    dirty.add(path)
+            elif mask & self.IN_ISDIR:
+                rescan = True
+        return dirty, rescan
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# 無 inotify 時的輪詢：模組目錄以 scandir 取得輸入檔的 (大小, mtime)，設計樹目錄只比對 mtime
+class PollingTreeWatcher(TreeWatcher):
+    def __init__(self, logger, interval=1.0):
+        super().__init__(logger)
+        self.interval = interval
+        self.snapshots = {}
+        self.tree_mtimes = {}
+
+    def reset(self, tree_dirs, module_dirs):
+        super().reset(tree_dirs, module_dirs)
+        self.snapshots = {d: self._snapshot(d, names) for d, names in self.module_dirs.items()}
+        self.tree_mtimes = {d: self._mtime(d) for d in self.tree_dirs}
+
+    def _mtime(self, path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _snapshot(self, mod_dir, names):
+        snap = {}
+        try:
+            with os.scandir(mod_dir) as it:
+                for entry in it:
+                    if entry.name in names:
+                        st = entry.stat()
+                        snap[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+        return snap
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval) if timeout is not None else self.interval)
+        rescan = any(self._mtime(d) != mtime for d, mtime in self.tree_mtimes.items())
+        dirty = set()
+        for d, names in self.module_dirs.items():
+            snap = self._snapshot(d, names)
+            if snap != self.snapshots.get(d):
+                self.snapshots[d] = snap
+                dirty.add(d)
+        if rescan:
+            self.tree_mtimes = {d: self._mtime(d) for d in self.tree_dirs}
+        return dirty, rescan
+
+def create_tree_watcher(logger, backend="auto", poll_interval=1.0):
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyTreeWatcher(logger)
+        except (OSError, AttributeError) as e:
+            logger.warning(f"無法使用 inotify，改用輪詢監看: {e}")
+    return PollingTreeWatcher(logger, poll_interval)
+
+# 增量稽核快取：以輸入檔指紋與 Golden Spec 摘要判斷模組是否需要重新稽核
+class AuditResultCache:
+    # 工具啟動結果屬於每次執行，不隨稽核結果快取；命中的模組仍會重新啟動工具
+    TOOL_COLUMNS = ("Tool_Exit", "Tool_Latency_s")
+
+    def __init__(self, cache_path, spec, logger, use_hash=False, rebuild=False):
+        self.cache_path = cache_path
+        self.logger = logger
+        self.use_hash = use_hash
+        self.spec_digest = self.digest_spec(spec)
+        self.entries = {} if rebuild else self._load()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest_spec(spec):
+        payload = json.dumps(spec, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.warning(f"稽核快取無法讀取，將重新建立: {e}")
+            return {}
+        if data.get("version") != AuditorConfig.CACHE_VERSION or data.get("spec_digest") != self.spec_digest:
+            self.logger.info("Golden Spec 或快取格式已變更，既有稽核快取失效")
+            return {}
+        return data.get("entries", {})
+
+    def _hash_file(self, path):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def fingerprint(self, mod_dir, listing=None):
+        fp = []
+        for name in module_input_files(os.path.basename(mod_dir)):
+            path = os.path.join(mod_dir, name)
+            # 探索階段已取得檔案清單時，不存在的檔案不必再 stat
+            if listing is not None and name not in listing:
+                fp.append([name, None])
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                fp.append([name, None])
+                continue
+            item = [name, st.st_size, st.st_mtime_ns]
+            if self.use_hash:
+                try:
+                    item.append(self._hash_file(path))
+                except OSError:
+                    item.append(None)
+            fp.append(item)
+        return fp
+
+    def lookup(self, mod_dir, fp):
+        entry = self.entries.get(os.path.abspath(mod_dir))
+        if entry and entry.get("fingerprint") == fp:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, mod_dir, fp, result, violations):
+        self.entries[os.path.abspath(mod_dir)] = {
+            "fingerprint": fp,
+            "result": {k: v for k, v in result.items() if k not in self.TOOL_COLUMNS},
+            "violations": [v.as_tuple() for v in violations]}
+
+    def save(self, target_dirs):
+        # 只保留本次掃描到的模組，避免已刪除的模組永久殘留在快取中
+        keep = {os.path.abspath(d) for d in target_dirs}
+        data = {
+            "version": AuditorConfig.CACHE_VERSION,
+            "spec_digest": self.spec_digest,
+            "entries": {k: v for k, v in self.entries.items() if k in keep}}
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            self.logger.error(f"稽核快取寫入失敗: {e}")
+
+# 稽核歷史：每次執行的模組結果、違規明細與階段耗時寫入 SQLite，供跨次比對
+class AuditHistoryStore:
+    # 模組以相對輸入目錄的路徑為鍵：巢狀目錄下不同位置的同名模組各自保留
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY AUTOINCREMENT, started_at TEXT, spec_digest TEXT,
+            total INTEGER, passed INTEGER, failed INTEGER, partial INTEGER, elapsed_s REAL);
+        CREATE TABLE IF NOT EXISTS modules (
+            run_id INTEGER, module_path TEXT, module_id TEXT, engineer TEXT, status TEXT, total_issues INTEGER,
+            digest TEXT, wall_s REAL, PRIMARY KEY (run_id, module_path)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS violations (
+            run_id INTEGER, module_path TEXT, module_id TEXT, seq INTEGER, vtype TEXT, vkey TEXT,
+            message TEXT, severity TEXT, field TEXT);
+        CREATE TABLE IF NOT EXISTS timings (
+            run_id INTEGER, stage TEXT, seconds REAL);
+        CREATE INDEX IF NOT EXISTS idx_modules_module ON modules (module_id);
+        CREATE INDEX IF NOT EXISTS idx_modules_engineer ON modules (engineer);
+        CREATE INDEX IF NOT EXISTS idx_violations_run_path ON violations (run_id, module_path);
+        CREATE INDEX IF NOT EXISTS idx_violations_module ON violations (module_id);
+        CREATE INDEX IF NOT EXISTS idx_violations_type ON violations (vtype);
+        CREATE INDEX IF NOT EXISTS idx_timings_run ON timings (run_id);
+    """
+
+    def __init__(self, db_path, logger):
+        import sqlite3
+        self.logger = logger
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def digest_errors(status, keys):
+        payload = "\n".join([status] + sorted(keys))
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+    def record_run(self, spec_digest, records, partial, rules):
+        # records: (module_path, row, violations, wall_s)；違規類型即規則代號，整次執行在單一交易內寫入
+        # 摘要與比對都用結構化鍵，訊息文字只供顯示
+        records = [(path, row, [(v, v.key(), rules.format_violation(v)) for v in violations], wall_s)
+                   for path, row, violations, wall_s in records]
+        passed = sum(1 for _, row, _, _ in records if row["Status"] == AuditorConfig.PASS)
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started_at, spec_digest, total, passed, failed, partial) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), spec_digest, len(records), passed,
+                 len(records) - passed, int(bool(partial))))
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO modules VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((run_id, path, row["Module_ID"], row["Engineer"], row["Status"], row["Total_Issues"],
+                  self.digest_errors(row["Status"], [key for _, key, _ in items]), wall_s) for path, row, items, wall_s in records))
+            self.conn.executemany(
+                """INSERT INTO violations (run_id, module_id, seq, vtype, message, severity, field, module_path, vkey)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                ((run_id, row["Module_ID"], seq, v.rule_id, msg, v.severity, v.field, path, key)
+                 for path, row, items, _ in records for seq, (v, key, msg) in enumerate(items)))
+        return run_id
+
+    def record_timings(self, run_id, stages, elapsed):
+        with self.conn:
+            self.conn.executemany("INSERT INTO timings VALUES (?, ?, ?)", ((run_id, k, v) for k, v in stages.items()))
+            self.conn.execute("UPDATE runs SET elapsed_s = ? WHERE run_id = ?", (elapsed, run_id))
+
+    def resolve_run(self, ref, current_run):
+        # 接受 run id 或 last (本次之前最近一次)
+        if str(ref).lower() == "last":
+            row = self.conn.execute("SELECT MAX(run_id) FROM runs WHERE run_id < ?", (current_run,)).fetchone()
+        else:
+            row = self.conn.execute("SELECT run_id FROM runs WHERE run_id = ?", (int(ref),)).fetchone()
+        return row[0] if row else None
+
+    def _violations(self, run_id, paths):
+        # {module_path: {vtype: {vkey: message}}}
+        found = {}
+        paths = list(paths)
+        for i in range(0, len(paths), 500):
+            chunk = paths[i:i + 500]
+            query = f"SELECT module_path, vtype, vkey, message FROM violations WHERE run_id = ? AND module_path IN ({','.join('?' * len(chunk))}) ORDER BY module_path, seq"
+            for path, vtype, vkey, message in self.conn.execute(query, (run_id, *chunk)):
+                found.setdefault(path, {}).setdefault(vtype, {})[vkey] = message
+        return found
+
+    def diff(self, base_run, cur_run):
+        # 先以每模組摘要找出有變動的模組，只對這些模組取出違規明細比對
+        changed = self.conn.execute(
+            """SELECT c.module_path, c.module_id, c.engineer, b.module_path IS NULL FROM modules c
+               LEFT JOIN modules b ON b.run_id = ? AND b.module_path = c.module_path
+               WHERE c.run_id = ? AND (b.module_path IS NULL OR b.digest != c.digest)""", (base_run, cur_run)).fetchall()
+        removed = [r[0] for r in self.conn.execute(
+            """SELECT b.module_path FROM modules b
+               LEFT JOIN modules c ON c.run_id = ? AND c.module_path = b.module_path
+               WHERE b.run_id = ? AND c.module_path IS NULL""", (cur_run, base_run))]
+        modules = {path: (module_id, engineer) for path, module_id, engineer, _ in changed}
+        before = self._violations(base_run, modules)
+        after = self._violations(cur_run, modules)
+        result = {"baseline_run": base_run, "current_run": cur_run, "new": [], "fixed": [], "changed": [],
+                  "added_modules": sorted(p for p, _, _, added in changed if added), "removed_modules": sorted(removed)}
+        for path in sorted(modules):
+            module_id, engineer = modules[path]
+            old, new = before.get(path, {}), after.get(path, {})
+            base = {"module": module_id, "path": path}
+            for vtype in sorted(new.keys() - old.keys()):
+                result["new"].extend(dict(base, engineer=engineer, type=vtype, message=m, key=k) for k, m in new[vtype].items())
+            for vtype in sorted(old.keys() - new.keys()):
+                result["fixed"].extend(dict(base, type=vtype, message=m) for m in old[vtype].values())
+            for vtype in sorted(old.keys() & new.keys()):
+                if old[vtype].keys() != new[vtype].keys():
+                    result["changed"].append(dict(base, engineer=engineer, type=vtype,
+                                                  before=list(old[vtype].values()), after=list(new[vtype].values()),
+                                                  added=[k for k in new[vtype] if k not in old[vtype]]))
+        return result
+
+    @staticmethod
+    def regressions(diff):
+        # 只通知新出現或內容改變的違規 (以模組路徑與結構化鍵表示)
+        found = {}
+        for item in diff["new"]:
+            found.setdefault(item["path"], set()).add(item["key"])
+        for item in diff["changed"]:
+            found.setdefault(item["path"], set()).update(item["added"])
+        return found
+
+    def close(self):
+        self.conn.close()
+
+# 單一模組稽核逾時 (由 worker 內的 SIGALRM 觸發)
+# 繼承 BaseException，避免被解析函式中的 except Exception 吞掉
+class ModuleTimeoutError(BaseException):
+    pass
+
+def _raise_module_timeout(signum, frame):
+    raise ModuleTimeoutError()
+
+# 唯讀的稽核環境：編譯後的規則、解析器與稽核管理器每個 process 只建立一次，任務只需帶模組路徑與目錄清單
+class AuditContext:
+    def __init__(self, rules, logger, module_timeout=0):
+        self.rules = rules
+        self.logger = logger
+        self.module_timeout = module_timeout
+        self.manager = SignoffAuditManager(rules, logger)
+
+_WORKER_CONTEXT = None
+_WORKER_PROFILER = None
+
+# 規則在 pool 建立時隨 initializer 送到每個 worker 一次 (fork 時直接繼承，不需序列化)
+def init_pool_worker(log_queue, rules, module_timeout=0, profile_dir=None, parse_memo=None):
+    global _WORKER_CONTEXT
+    # Ctrl-C 由主程序統一處理，避免 worker 各自中斷而遺失結果
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    attach_queue_logger(log_queue)
+    _WORKER_CONTEXT = AuditContext(rules, logging.getLogger("IC_CAD_Auditor"), module_timeout)
+    PARSE_MEMO.configure(parse_memo)
+    if profile_dir:
+        start_worker_profiler(profile_dir)
+
+# --profile：每個 worker 各自以 cProfile 量測，結束時寫出 worker_<pid>.prof 由主程序合併
+def start_worker_profiler(profile_dir):
+    global _WORKER_PROFILER
+    import cProfile
+    from multiprocessing import util
+    _WORKER_PROFILER = cProfile.Profile()
+    _WORKER_PROFILER.enable()
+    util.Finalize(None, dump_worker_profile, args=(profile_dir,), exitpriority=10)
+
+def dump_worker_profile(profile_dir):
+    global _WORKER_PROFILER
+    if _WORKER_PROFILER is None:
+        return
+    _WORKER_PROFILER.disable()
+    _WORKER_PROFILER.dump_stats(os.path.join(profile_dir, f"worker_{os.getpid()}.prof"))
+    _WORKER_PROFILER = None
+
+def build_system_error_output(target_dir, reason):
+    row = {
+        "Module_ID": os.path.basename(target_dir),
+        "Engineer": "Unknown",
+        "Status": AuditorConfig.SYSTEM_ERROR,
+        "Total_Issues": 1}
+    return {"dir": target_dir, "row": row, "violations": [Violation("system_error", actual=reason)]}
+
+def run_module_audit(target_dir, listing, context, prefetched=None):
+    module_timeout, log = context.module_timeout, context.logger
+    use_alarm = bool(module_timeout) and hasattr(signal, "setitimer")
+    FUNCTION_METRICS.begin_module()
+    start = time.perf_counter()
+    if use_alarm:
+        prev_handler = signal.signal(signal.SIGALRM, _raise_module_timeout)
+        signal.setitimer(signal.ITIMER_REAL, module_timeout)
+    try:
+        out = audit_single_module(target_dir, context.manager, listing, prefetched)
+    except ModuleTimeoutError:
+        log.error(f"模組 {os.path.basename(target_dir)}: 稽核逾時 (>{module_timeout}s)，標記為系統錯誤")
+        out = build_system_error_output(target_dir, f"稽核逾時 (>{module_timeout}s)")
+    except Exception as e:
+        log.error(f"模組 {os.path.basename(target_dir)}: 稽核發生未預期錯誤 -> {e}")
+        out = build_system_error_output(target_dir, f"稽核異常: {e}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, prev_handler)
+        funcs = FUNCTION_METRICS.end_module()
+    # 量測結果隨稽核結果一起回傳 (逾時的模組也保留已完成部分的量測)
+    out["perf"] = {"wall_s": time.perf_counter() - start, "funcs": funcs}
+    return out
 
 # 報表彙整與平行處理
-def multiprocessing_worker(args):
-    target_dir, spec_dict = args
+# 任務為 (目錄, 清單) 或自適應排程附上預讀內容的 (目錄, 清單, 預讀檔案)
+def multiprocessing_worker(task):
+    target_dir, listing = task[:2]
+    prefetched = task[2] if len(task) > 2 else None
+    return run_module_audit(target_dir, listing, _WORKER_CONTEXT, prefetched)
+
+def multiprocessing_batch_worker(batch):
+    return [multiprocessing_worker(args) for args in batch]
+
+def audit_single_module(target_dir, manager, listing=None, prefetched=None):
     module_name = os.path.basename(target_dir)
-    log = logging.getLogger("IC_CAD_Auditor")
     module_errors = []
+    rules = manager.rules
     
-    # 執行稽核
-    manager = SignoffAuditManager(spec_dict, log)
-    manager.audit_environment(target_dir, module_name, module_errors)
-    manager.audit_formal_logic(target_dir, module_name, module_errors)
-    manager.audit_resources_and_tools(target_dir, module_errors)
-    manager.audit_pdk_consistency(target_dir, module_errors)
+    # 執行稽核 (manager 與解析器由 AuditContext 跨模組重用)
+    art = manager.load_module(target_dir, listing, prefetched)
+    checks_ran, checks_hit = manager.run_checks(art, module_errors, rules.check_order, rules.fail_fast)
     
-    js = FileParsingEngine(log).read_json_safe(os.path.join(target_dir, "project_status.json"))
+    js = art.status_json()
     owner_info = js.get("owner", "Admin") if js else "Unknown"
     
-    trigger = AuditActionTrigger(log)
+    # 失敗通知與 EDA 工具觸發皆由主程序統一處理
     audit_status = AuditorConfig.PASS if not module_errors else AuditorConfig.FAIL
-    if audit_status == AuditorConfig.FAIL:
-        trigger.notify_owner_simulation(module_name, owner_info, module_errors)
-    else:
-        trigger.trigger_mock_eda_tool(module_name)
     
-    return {
+    # Issue_Summary 由主程序在輸出報表前才格式化
+    row = {
         "Module_ID": module_name,
         "Engineer": owner_info,
         "Status": audit_status,
-        "Total_Issues": len(module_errors),
-        "Issue_Summary": " | ".join(module_errors) if module_errors else "All Correct" }
+        "Total_Issues": len(module_errors)}
+    return {"dir": target_dir, "row": row, "violations": module_errors, "io": art.io_counts(),
+            "checks": {"ran": checks_ran, "hit": checks_hit}}
+
+# 分散式稽核：依估計成本 (輸入檔大小) 以 LPT 將模組分成負載相近的 shard
+def estimate_module_cost(mod_dir, listing=None):
+    cost = 0
+    for name in module_input_files(os.path.basename(mod_dir)):
+        if listing is not None and name not in listing:
+            continue
+        try:
+            st = os.stat(os.path.join(mod_dir, name))
+        except OSError:
+            continue
+        # 網表只掃描表頭，成本以掃描預算為上限
+        cost += min(st.st_size, AuditorConfig.HEADER_SCAN_BYTES) if ".v" in name else st.st_size
+    return cost + 4096
+
+def plan_shards(mod_dirs, listings, n_shards):
+    import heapq
+    n_shards = max(1, min(n_shards, len(mod_dirs)))
+    costs = sorted(((estimate_module_cost(d, listings.get(d)), d) for d in mod_dirs), reverse=True)
+    heap = [(0, i) for i in range(n_shards)]
+    shards = [[] for _ in range(n_shards)]
+    loads = [0] * n_shards
+    for cost, d in costs:
+        load, i = heapq.heappop(heap)
+        shards[i].append(d)
+        loads[i] = load + cost
+        heapq.heappush(heap, (loads[i], i))
+    return [(shard, load) for shard, load in zip(shards, loads) if shard]
+
+# 自適應排程的預讀：在主程序的 I/O 執行緒讀入模組的小型輸入檔，worker 只做解析與比對
+def prefetch_module_files(mod_dir, listing=None, max_file_bytes=None):
+    limit = max_file_bytes or AuditorConfig.PREFETCH_MAX_FILE_BYTES
+    files, nbytes = {}, 0
+    start = time.perf_counter()
+    for name in module_input_files(os.path.basename(mod_dir)):
+        if listing is not None and name not in listing:
+            continue
+        try:
+            with open(os.path.join(mod_dir, name), 'rb') as f:
+                if os.fstat(f.fileno()).st_size > limit:
+                    continue
+                data = f.read()
+        except OSError:
+            # 讀取失敗的檔案交由 worker 自行讀取並記錄錯誤
+            continue
+        files[name] = data
+        nbytes += len(data)
+    return files, nbytes, time.perf_counter() - start
+
+# 預讀並行度以 AIMD 調整：每檔讀取延遲維持在觀察到的最低水準附近就加一，明顯變慢 (儲存端飽和) 就減半
+class AdaptiveConcurrency:
+    def __init__(self, initial, minimum=1, maximum=64, tolerance=0.5, floor=0.0005):
+        self.min_limit = max(1, minimum)
+        self.max_limit = max(self.min_limit, maximum)
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.tolerance = tolerance
+        self.floor = floor
+        self.peak = self.limit
+        self.baseline = None
+        self.ewma = None
+        self.samples = 0
+        self.decreases = 0
+
+    def observe(self, latency):
+        self.ewma = latency if self.ewma is None else 0.8 * self.ewma + 0.2 * latency
+        self.samples += 1
+        # 每累積一個視窗的樣本才調整一次，避免單一慢檔案造成震盪
+        if self.samples < self.limit:
+            return
+        self.samples = 0
+        # 基準緩慢上修，負載本身變重時不會一直減半
+        self.baseline = self.ewma if self.baseline is None else min(self.baseline * 1.05, self.ewma)
+        # 延遲差距小於 floor 秒 (本機快取命中的等級) 時不視為飽和
+        if self.ewma > self.baseline * (1 + self.tolerance) and self.ewma - self.baseline > self.floor:
+            self.limit = max(self.min_limit, self.limit // 2)
+            self.decreases += 1
+        else:
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.peak = max(self.peak, self.limit)
+
+def parse_endpoint(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def is_loopback_host(host):
+    import ipaddress
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+# shard 傳輸層：send() 送出一個請求並取回回應，新增傳輸方式 (例如叢集排程器) 只需實作此介面
+class ShardTransport:
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def send(self, endpoint, request):
+        raise NotImplementedError
+
+# TCP 傳輸：4 bytes 長度 + UTF-8 JSON (worker 需能存取相同的共享檔案系統路徑)
+class TcpShardTransport(ShardTransport):
+    @staticmethod
+    def write_message(sock, payload):
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        sock.sendall(len(data).to_bytes(4, "big") + data)
+
+    @staticmethod
+    def read_message(sock):
+        header = TcpShardTransport._read_exact(sock, 4)
+        return json.loads(TcpShardTransport._read_exact(sock, int.from_bytes(header, "big")).decode('utf-8'))
+
+    @staticmethod
+    def _read_exact(sock, size):
+        chunks = []
+        while size:
+            chunk = sock.recv(min(size, 1 << 20))
+            if not chunk:
+                raise ConnectionError("連線在訊息傳輸途中中斷")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def send(self, endpoint, request):
+        import socket
+        with socket.create_connection(parse_endpoint(endpoint), timeout=self.timeout) as sock:
+            self.write_message(sock, request)
+            return self.read_message(sock)
+
+SHARD_TRANSPORTS = {"tcp": TcpShardTransport}
+
+# shard worker：在運算節點上常駐，以本機 process pool 稽核收到的 shard (相同 spec 的 pool 重複使用)
+class ShardWorkerServer:
+    def __init__(self, endpoint, jobs, logger, parse_memo=None):
+        self.endpoint = endpoint
+        self.jobs = max(1, jobs)
+        self.logger = logger
+        self.token = os.environ.get("AUDIT_SHARD_TOKEN")
+        self.parse_memo = parse_memo
+        self.pools = {}
+        self._lock = threading.Lock()
+        self.log_queue = self.listener = None
+
+    def _pool_for(self, spec, module_timeout):
+        from multiprocessing import Pool
+        key = (AuditResultCache.digest_spec(spec), module_timeout)
+        with self._lock:
+            if key not in self.pools:
+                for old in self.pools.values():
+                    old.close()
+                rules = CompiledAuditRules(spec)
+                self.pools = {key: Pool(processes=self.jobs, initializer=init_pool_worker,
+                                        initargs=(self.log_queue, rules, module_timeout, None, self.parse_memo))}
+            return self.pools[key]
+
+    def handle(self, request):
+        if self.token and request.get("token") != self.token:
+            return {"ok": False, "error": "token 驗證失敗"}
+        if request.get("op") == "ping":
+            return {"ok": True}
+        start = time.time()
+        tasks = [(d, frozenset(listing) if listing is not None else None) for d, listing in request["tasks"]]
+        pool = self._pool_for(request["spec"], request.get("module_timeout", 0))
+        outputs = pool.map(multiprocessing_worker, tasks, chunksize=max(1, len(tasks) // (self.jobs * 4)))
+        for out in outputs:
+            out["violations"] = [v.as_tuple() for v in out["violations"]]
+        self.logger.info(f"shard {request.get('shard_id')}: 完成 {len(outputs)} 個模組，耗時 {time.time() - start:.2f}s")
+        return {"ok": True, "outputs": outputs}
+
+    def serve_forever(self):
+        import socketserver
+        server_ref = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                try:
+                    request = TcpShardTransport.read_message(self.request)
+                    response = server_ref.handle(request)
+                except Exception as e:
+                    server_ref.logger.error(f"shard 請求處理失敗: {e}")
+                    response = {"ok": False, "error": str(e)}
+                try:
+                    TcpShardTransport.write_message(self.request, response)
+                except OSError as e:
+                    server_ref.logger.error(f"shard 回應傳送失敗: {e}")
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.log_queue, self.listener = start_log_listener(self.logger)
+        server = socketserver.ThreadingTCPServer(parse_endpoint(self.endpoint), Handler)
+        self.logger.info(f"shard worker 已啟動於 {self.endpoint} (Jobs={self.jobs})，按 Ctrl-C 結束")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.logger.info("shard worker 結束")
+        finally:
+            server.server_close()
+            for pool in self.pools.values():
+                pool.terminate()
+                pool.join()
+            self.listener.stop()
+
+# shard 協調者：每個 worker 一條派送執行緒向共用佇列取 shard；失敗或逾時的 shard 放回佇列改派其他 worker
+class ShardCoordinator:
+    MAX_ENDPOINT_FAILURES = 3
+
+    def __init__(self, transport, endpoints, spec, logger, retries=2, module_timeout=0):
+        self.transport = transport
+        self.endpoints = list(endpoints)
+        self.spec = spec
+        self.logger = logger
+        self.retries = retries
+        self.module_timeout = module_timeout
+        self.token = os.environ.get("AUDIT_SHARD_TOKEN")
+
+    def run(self, shards, listings):
+        from collections import deque
+        queue = deque({"id": i, "dirs": dirs, "cost": cost, "attempt": 0, "failed_on": set()}
+                      for i, (dirs, cost) in enumerate(shards))
+        cond = threading.Condition()
+        state = {"inflight": 0, "alive": len(self.endpoints)}
+        results = {}
+
+        def take(endpoint):
+            # 優先取沒有在此 worker 失敗過的 shard
+            for item in queue:
+                if endpoint not in item["failed_on"] or state["alive"] == 1:
+                    queue.remove(item)
+                    return item
+            return queue.popleft()
+
+        def dispatch(endpoint):
+            failures = 0
+            while True:
+                with cond:
+                    while not queue and state["inflight"]:
+                        cond.wait()
+                    if not queue:
+                        return
+                    item = take(endpoint)
+                    state["inflight"] += 1
+                try:
+                    outputs = self._send_shard(endpoint, item, listings)
+                    failures = 0
+                    with cond:
+                        results[item["id"]] = outputs
+                except Exception as e:
+                    failures += 1
+                    with cond:
+                        item["attempt"] += 1
+                        item["failed_on"].add(endpoint)
+                        if item["attempt"] <= self.retries:
+                            self.logger.warning(f"shard {item['id']} 於 {endpoint} 失敗 ({e})，重新派送 (第 {item['attempt']} 次重試)")
+                            queue.append(item)
+                        else:
+                            self.logger.error(f"shard {item['id']} 重試 {self.retries} 次仍失敗，{len(item['dirs'])} 個模組標記為系統錯誤")
+                            results[item["id"]] = [build_system_error_output(d, f"分散式稽核失敗: {e}") for d in item["dirs"]]
+                finally:
+                    with cond:
+                        state["inflight"] -= 1
+                        cond.notify_all()
+                if failures >= self.MAX_ENDPOINT_FAILURES:
+                    with cond:
+                        state["alive"] -= 1
+                        cond.notify_all()
+                    self.logger.error(f"worker {endpoint} 連續失敗 {failures} 次，停止派送至此節點")
+                    return
+
+        with ThreadPoolExecutor(max_workers=len(self.endpoints)) as executor:
+            list(executor.map(dispatch, self.endpoints))
+        for item in queue:
+            self.logger.error(f"shard {item['id']} 無可用 worker，{len(item['dirs'])} 個模組標記為系統錯誤")
+            results[item["id"]] = [build_system_error_output(d, "分散式稽核失敗: 無可用 worker") for d in item["dirs"]]
+        return [out for i in sorted(results) for out in results[i]]
+
+    def _send_shard(self, endpoint, item, listings):
+        start = time.time()
+        # 共享檔案系統上以絕對路徑傳遞，結果再對應回本地的模組路徑
+        abs_dirs = {os.path.abspath(d): d for d in item["dirs"]}
+        listing = lambda d: sorted(listings[d]) if listings.get(d) is not None else None
+        request = {"op": "audit", "shard_id": item["id"], "token": self.token, "spec": self.spec,
+                   "module_timeout": self.module_timeout, "tasks": [[a, listing(d)] for a, d in abs_dirs.items()]}
+        response = self.transport.send(endpoint, request)
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "未知錯誤"))
+        outputs = response["outputs"]
+        if len(outputs) != len(abs_dirs):
+            raise RuntimeError(f"回傳模組數不符 ({len(outputs)}/{len(abs_dirs)})")
+        for out in outputs:
+            out["dir"] = abs_dirs[out["dir"]]
+            out["violations"] = [Violation.from_tuple(v) for v in out["violations"]]
+        self.logger.info(f"shard {item['id']} ({len(outputs)} 個模組) 由 {endpoint} 完成，耗時 {time.time() - start:.2f}s")
+        return outputs
+
+# 批次向量化稽核：所有模組的欄位與 tool_info.csv 合併成欄式資料表，以欄運算一次完成比對
+class BatchAuditEngine:
+    # 錯誤訊息的排序階段，與逐模組稽核的輸出順序一致
+    STAGE_FILES, STAGE_STATUS, STAGE_NETLIST, STAGE_FORMAL, STAGE_TOOLS, STAGE_TOOL_ROWS, STAGE_SETUP = range(7)
+
+    def __init__(self, rules, logger, io_threads=8, module_timeout=0):
+        self.rules = rules
+        self.logger = logger
+        self.io_threads = max(1, io_threads)
+        self.module_timeout = module_timeout
+        self.manager = SignoffAuditManager(rules, logger)
+
+    def _load_module(self, mod_dir, listing=None):
+        FUNCTION_METRICS.begin_module()
+        start = time.perf_counter()
+        try:
+            rec, tool_rows, io_counts = self._extract_module(mod_dir, listing)
+        finally:
+            funcs = FUNCTION_METRICS.end_module()
+        return rec, tool_rows, io_counts, {"wall_s": time.perf_counter() - start, "funcs": funcs}
+
+    def _extract_module(self, mod_dir, listing=None):
+        # 每個模組只做一次 I/O，取出稽核規則需要的純量欄位與工具列
+        art = self.manager.load_module(mod_dir, listing)
+        field_rules = self.rules.field_rules
+        js = art.status_json()
+        rec = {"dir": mod_dir, "Module_ID": art.mod_name, "listing": art.listing(),
+               "json_ok": bool(js), "owner": js.get("owner", "Admin") if js else "Unknown"}
+        for rule in field_rules["status_rules"]:
+            rec[f"status.{rule.field}"] = js.get(rule.field) if js else None
+        for v_type in ("golden", "revised"):
+            v_info = art.netlist_header(v_type)
+            rec[f"{v_type}_ok"] = bool(v_info)
+            for rule in field_rules["netlist_rules"]:
+                rec[f"{v_type}.{rule.field}"] = v_info.get(rule.field) if v_info else None
+        for prefix, name in (("formal", "formal_setup.tcl"), ("setup", "setup.tcl")):
+            ok = art.tcl_settings(name) is not None
+            rec[f"{prefix}_ok"] = ok
+            for rule in field_rules[f"{prefix}_rules"]:
+                rec[f"{prefix}.{rule.field}"] = art.tcl_field(name, rule.field) if ok else None
+        rec["formal_libs"] = art.tcl_field("formal_setup.tcl", "libs") if rec["formal_ok"] else []
+        tool_rows = []
+        for idx, r in enumerate(art.tool_rows()):
+            row = {k: v for k, v in r.items() if k is not None}
+            row.update({"dir": mod_dir, "row_idx": idx})
+            tool_rows.append(row)
+        return rec, tool_rows, art.io_counts()
+
+    def run(self, mod_dirs, listings=None):
+        import pandas as pd
+        listings = listings or {}
+        results, failed = self._read_modules(mod_dirs, listings)
+        loaded = [results[d] for d in mod_dirs if d in results]
+        stuck = [build_system_error_output(d, failed[d]) for d in mod_dirs if d in failed]
+        if not loaded:
+            return stuck
+        mods = pd.DataFrame([item[0] for item in loaded], dtype=object)
+        tools = pd.DataFrame([row for item in loaded for row in item[1]], dtype=object)
+        # 各模組 CSV 欄位不一致時，補齊的空值維持 None (與 dict.get 的結果相同)
+        tools = tools.where(tools.notna(), None)
+
+        violations = []
+        self._check_environment(mods, violations)
+        self._check_formal(mods, violations)
+        self._check_tools(mods, tools, violations)
+        self._check_setup(mods, violations)
+        errors_by_dir = self._aggregate(violations)
+
+        outputs = []
+        for rec, _, io_counts, perf in loaded:
+            module_errors = errors_by_dir.get(rec["dir"], [])
+            audit_status = AuditorConfig.PASS if not module_errors else AuditorConfig.FAIL
+            row = {
+                "Module_ID": rec["Module_ID"],
+                "Engineer": rec["owner"],
+                "Status": audit_status,
+                "Total_Issues": len(module_errors)}
+            outputs.append({"dir": rec["dir"], "row": row, "violations": module_errors, "io": io_counts, "perf": perf})
+        return outputs + stuck
+
+    def _read_modules(self, mod_dirs, listings):
+        # 讀取執行緒為 daemon：單一模組讀取超過 --module-timeout (例如無回應的 NFS 或 FIFO) 即放棄並標記為系統錯誤，
+        # 另補一條執行緒處理其餘模組，卡住的執行緒也不會阻擋程式結束；讀取異常同樣只影響該模組
+        pending = queue.Queue()
+        for d in mod_dirs:
+            pending.put(d)
+        finished = queue.Queue()
+        started = {}
+
+        def reader():
+            while True:
+                try:
+                    d = pending.get_nowait()
+                except queue.Empty:
+                    return
+                started[d] = time.monotonic()
+                try:
+                    finished.put((d, self._load_module(d, listings.get(d)), None))
+                except Exception as e:
+                    finished.put((d, None, e))
+
+        def spawn():
+            threading.Thread(target=reader, daemon=True).start()
+
+        for _ in range(min(self.io_threads, len(mod_dirs))):
+            spawn()
+        results, failed = {}, {}
+        timeout = self.module_timeout
+        while len(results) + len(failed) < len(mod_dirs):
+            try:
+                d, item, error = finished.get(timeout=1.0 if timeout else None)
+            except queue.Empty:
+                now = time.monotonic()
+                for d, t0 in list(started.items()):
+                    if d not in results and d not in failed and now - t0 > timeout:
+                        self.logger.error(f"模組 {os.path.basename(d)}: 讀取逾時 (>{timeout}s)，標記為系統錯誤")
+                        failed[d] = f"讀取逾時 (>{timeout}s)"
+                        spawn()
+                continue
+            if d in failed:
+                continue
+            if error is not None:
+                self.logger.error(f"模組 {os.path.basename(d)}: 稽核發生未預期錯誤 -> {error}")
+                failed[d] = f"稽核異常: {error}"
+                continue
+            results[d] = item
+        return results, failed
+
+    def _emit(self, violations, frame, records, stage, item=0, sub=0):
+        import pandas as pd
+        if len(frame):
+            violations.append(pd.DataFrame({
+                "dir": frame["dir"].to_numpy(), "stage": stage, "item": item, "sub": sub, "violation": list(records)}))
+
+    def _aggregate(self, violations):
+        import pandas as pd
+        if not violations:
+            return {}
+        merged = pd.concat(violations, ignore_index=True)
+        merged = merged.sort_values(["dir", "stage", "item", "sub"], kind="stable")
+        return merged.groupby("dir", sort=False)["violation"].agg(list).to_dict()
+
+    def _check_field_rules(self, frame, source, prefix, violations, stage, item_base=0, subject=None):
+        import pandas as pd
+        for i, rule in enumerate(self.rules.field_rules[source]):
+            if rule.per_module:
+                expected = frame["Module_ID"].map(lambda mod: self.rules.expected_value(rule, mod))
+            else:
+                expected = pd.Series([rule.expected] * len(frame), index=frame.index, dtype=object)
+            actual = frame[f"{prefix}.{rule.field}"]
+            bad = actual != expected
+            records = [Violation(rule.rule_id, rule.field, e, a, rule.severity, subject)
+                       for a, e in zip(actual[bad], expected[bad])]
+            self._emit(violations, frame[bad], records, stage, item_base + i)
+
+    @instrumented("batch_check_environment")
+    def _check_environment(self, mods, violations):
+        listed = mods[["dir", "listing"]].explode("listing")
+        present = listed[listed["listing"].isin(MUST_HAVE_FILES)].groupby("dir")["listing"].nunique()
+        bad = mods[mods["dir"].map(present).fillna(0) < len(MUST_HAVE_FILES)]
+        self._emit(violations, bad, [Violation("missing_files", actual=sorted(MUST_HAVE_FILES - l)) for l in bad["listing"]], self.STAGE_FILES)
+
+        json_ok = mods["json_ok"].astype(bool)
+        self._emit(violations, mods[~json_ok], [Violation("status_unreadable", field="project_status.json") for _ in range(int((~json_ok).sum()))], self.STAGE_STATUS)
+        self._check_field_rules(mods[json_ok], "status_rules", "status", violations, self.STAGE_STATUS)
+
+    @instrumented("batch_check_formal")
+    def _check_formal(self, mods, violations):
+        for vi, v_type in enumerate(("golden", "revised")):
+            ok = mods[f"{v_type}_ok"].astype(bool)
+            self._emit(violations, mods[~ok], [Violation("netlist_unreadable", subject=v_type) for _ in range(int((~ok).sum()))], self.STAGE_NETLIST, vi * 1000)
+            self._check_field_rules(mods[ok], "netlist_rules", v_type, violations, self.STAGE_NETLIST, vi * 1000 + 1, subject=v_type)
+
+        ok = mods["formal_ok"].astype(bool)
+        self._emit(violations, mods[~ok], [Violation("formal_unreadable", field="formal_setup.tcl") for _ in range(int((~ok).sum()))], self.STAGE_FORMAL)
+        formal = mods[ok]
+        lib_count = formal["formal_libs"].map(len)
+        distinct = formal[["dir", "formal_libs"]].explode("formal_libs").groupby("dir")["formal_libs"].nunique()
+        missing = lib_count < 2
+        conflict = ~missing & (formal["dir"].map(distinct).fillna(0) > 1)
+        self._emit(violations, formal[missing], [Violation("formal_libs_missing", field="libs", actual=libs) for libs in formal.loc[missing, "formal_libs"]], self.STAGE_FORMAL)
+        self._emit(violations, formal[conflict], [Violation("formal_lib_conflict", field="libs", actual=libs) for libs in formal.loc[conflict, "formal_libs"]], self.STAGE_FORMAL)
+        self._check_field_rules(formal, "formal_rules", "formal", violations, self.STAGE_FORMAL, 1)
+
+    @instrumented("batch_check_tools")
+    def _check_tools(self, mods, tools, violations):
+        import pandas as pd
+        required = self.rules.required_tools
+        if len(tools):
+            named = tools[tools["Tool"].map(bool)]
+            present = named[named["Tool"].isin(required)].groupby("dir")["Tool"].nunique()
+            present_sets = named.groupby("dir")["Tool"].agg(set)
+        else:
+            present = present_sets = pd.Series(dtype=object)
+        bad = mods[mods["dir"].map(present).fillna(0) < len(required)]
+        records = [Violation("tools_missing", field="Tool", expected=self.rules.required_tools_sorted, actual=sorted(required - present_sets.get(d, set())))
+                   for d in bad["dir"]]
+        self._emit(violations, bad, records, self.STAGE_TOOLS)
+        if not len(tools):
+            return
+
+        # 規則欄位以工具名稱 map 成整欄，再與實際值做整欄比較
+        rules, fallback = self.rules.tool_rules, self.rules.default_tool_rule
+        tool = tools["Tool"]
+        known = tool.isin(list(rules))
+        min_mem = tool.map({k: r.min_memory for k, r in rules.items()}).where(known, fallback.min_memory)
+        stage = tool.map({k: r.stage for k, r in rules.items()})
+        prio_rule = tool.map({k: r.priority for k, r in rules.items()}).where(known, None)
+        date_field = tool.map({k: r.date_field for k, r in rules.items()}).where(known, fallback.date_field)
+        expect_date = tool.map({k: r.expect_date for k, r in rules.items()}).where(known, fallback.expect_date)
+
+        empty = pd.Series([None] * len(tools), index=tools.index, dtype=object)
+        mem_raw = tools["Memory_GB"] if "Memory_GB" in tools else empty
+        is_digit = mem_raw.str.isdigit().fillna(False).astype(bool)
+        mem = pd.to_numeric(mem_raw.where(is_digit), errors="coerce").fillna(0)
+        prio = tools["Priority"] if "Priority" in tools else empty
+        date = empty.copy()
+        for field in date_field.unique():
+            mask = date_field == field
+            if field in tools:
+                date[mask] = tools.loc[mask, field]
+
+        item = tools["row_idx"]
+        bad = date != expect_date
+        self._emit(violations, tools[bad], [Violation("tool_date", f, e, d, subject=t)
+                                            for t, f, e, d in zip(tool[bad], date_field[bad], expect_date[bad], date[bad])],
+                   self.STAGE_TOOL_ROWS, item[bad].to_numpy(), 0)
+        low_mem = mem < min_mem.astype(float)
+        bad = known & low_mem
+        self._emit(violations, tools[bad], [Violation("tool_memory", "Memory_GB", int(mm), int(m), subject=f"{t} {st}")
+                                            for t, st, mm, m in zip(tool[bad], stage[bad], min_mem[bad], mem[bad])],
+                   self.STAGE_TOOL_ROWS, item[bad].to_numpy(), 1)
+        bad = ~known & low_mem
+        self._emit(violations, tools[bad], [Violation("tool_unknown_memory", "Memory_GB", int(mm), int(m), subject=t)
+                                            for t, mm, m in zip(tool[bad], min_mem[bad], mem[bad])],
+                   self.STAGE_TOOL_ROWS, item[bad].to_numpy(), 1)
+        bad = known & prio_rule.notna() & (prio != prio_rule)
+        self._emit(violations, tools[bad], [Violation("tool_priority", "Priority", r, p, subject=t)
+                                            for t, r, p in zip(tool[bad], prio_rule[bad], prio[bad])],
+                   self.STAGE_TOOL_ROWS, item[bad].to_numpy(), 2)
+
+    @instrumented("batch_check_setup")
+    def _check_setup(self, mods, violations):
+        ok = mods["setup_ok"].astype(bool)
+        self._emit(violations, mods[~ok], [Violation("setup_unreadable", field="setup.tcl") for _ in range(int((~ok).sum()))], self.STAGE_SETUP)
+        self._check_field_rules(mods[ok], "setup_rules", "setup", violations, self.STAGE_SETUP)
+
+# 各階段耗時紀錄 (供 --import-profile 輸出)
+class PhaseTimer:
+    def __init__(self):
+        self.phases = []
+
+    def record(self, key, label, seconds):
+        self.phases.append((key, label, seconds))
+
+    @contextmanager
+    def phase(self, key, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(key, label, time.perf_counter() - start)
+
+    def as_dict(self):
+        totals = {}
+        for key, _, seconds in self.phases:
+            totals[key] = totals.get(key, 0.0) + seconds
+        return totals
+
+# 報表的前端分頁程式：資料由 final_report_data.js 提供，篩選、排序與分頁皆在瀏覽器端完成
+DASHBOARD_SCRIPT = """
+(function () {
+    var data = window.AUDIT_DATA || {columns: [], rows: []};
+    var cols = data.columns, rows = data.rows;
+    var statusCol = cols.indexOf("Status");
+    var searchCols = ["Module_ID", "Engineer", "Issue_Summary"].map(function (c) { return cols.indexOf(c); })
+        .filter(function (i) { return i >= 0; });
+    var state = {page: 0, size: 100, sortCol: -1, sortDir: 1, view: rows};
+    var $ = function (id) { return document.getElementById(id); };
+
+    var statuses = {};
+    rows.forEach(function (r) { statuses[r[statusCol]] = true; });
+    Object.keys(statuses).sort().forEach(function (s) {
+        var opt = document.createElement("option"); opt.value = opt.textContent = s; $("filter-status").appendChild(opt);
+    });
+
+    var head = document.createElement("tr");
+    ["#"].concat(cols).forEach(function (c, i) {
+        var th = document.createElement("th"); th.textContent = c;
+        if (i > 0) th.onclick = function () { sortBy(i - 1); };
+        head.appendChild(th);
+    });
+    $("audit-head").appendChild(head);
+
+    function applyFilter() {
+        var text = $("filter-text").value.toLowerCase(), status = $("filter-status").value;
+        state.view = rows.filter(function (r) {
+            if (status && r[statusCol] !== status) return false;
+            if (!text) return true;
+            return searchCols.some(function (i) { return String(r[i]).toLowerCase().indexOf(text) >= 0; });
+        });
+        if (state.sortCol >= 0) sortView();
+        state.page = 0; render();
+    }
+    function sortView() {
+        var c = state.sortCol, d = state.sortDir;
+        state.view.sort(function (a, b) {
+            var x = a[c], y = b[c];
+            if (typeof x === "number" && typeof y === "number") return (x - y) * d;
+            return String(x).localeCompare(String(y)) * d;
+        });
+    }
+    function sortBy(c) {
+        state.sortDir = state.sortCol === c ? -state.sortDir : 1;
+        state.sortCol = c;
+        if (state.view === rows) state.view = rows.slice();
+        sortView(); render();
+    }
+    function render() {
+        var body = $("audit-body"), start = state.page * state.size;
+        var pages = Math.max(1, Math.ceil(state.view.length / state.size));
+        var frag = document.createDocumentFragment();
+        state.view.slice(start, start + state.size).forEach(function (r, k) {
+            var tr = document.createElement("tr"), td = document.createElement("td");
+            td.textContent = start + k + 1; tr.appendChild(td);
+            r.forEach(function (v, i) {
+                var cell = document.createElement("td");
+                cell.textContent = v === null ? "" : v;
+                if (i === statusCol) cell.className = v === data.pass ? "status-pass" : "status-fail";
+                tr.appendChild(cell);
+            });
+            frag.appendChild(tr);
+        });
+        body.textContent = ""; body.appendChild(frag);
+        $("page-info").textContent = "第 " + (state.page + 1) + " / " + pages + " 頁，共 " + state.view.length + " 筆";
+    }
+    $("filter-text").oninput = applyFilter;
+    $("filter-status").onchange = applyFilter;
+    $("page-size").onchange = function () { state.size = parseInt(this.value, 10); state.page = 0; render(); };
+    $("page-prev").onclick = function () { if (state.page > 0) { state.page--; render(); } };
+    $("page-next").onclick = function () { if ((state.page + 1) * state.size < state.view.length) { state.page++; render(); } };
+    render();
+})();
+"""
+
+# --diff-against 只接受 run id 或 last，於參數解析時就擋下無效值
+def history_run_ref(value):
+    if value.lower() == "last":
+        return "last"
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"需為 run id 或 last: {value}")
 
 class MainAuditorCLI:
     def __init__(self):
-        self.logger = init_system_logger()
-        self.args = self._parse_cmd_args()
+        # 先解析參數，--help 不需建立 output/ 與日誌檔
+        self.timer = PhaseTimer()
+        self.run_summary = {}
+        self.exit_code = 0
+        self.interrupted = False
+        self.timer.record("imports", "模組匯入", _IMPORTS_DONE - _STARTUP_T0)
+        with self.timer.phase("args", "參數解析"):
+            self.args = self._parse_cmd_args()
+        with self.timer.phase("logger", "日誌初始化"):
+            self.logger = init_system_logger()
 
     def _parse_cmd_args(self):
         desc_text = "Digital IC Design Pre-Signoff Environment Audit Tool.\n針對簽核階段前的環境一致性、PDK版本及資源配置進行自動化稽核。"
@@ -317,42 +2144,256 @@ class MainAuditorCLI:
         parser.add_argument(
             "--input", 
             default="input_data", 
-            help="指定模組數據源路徑。系統會自動掃描該目錄下所有 mod_ 開頭的子資料夾。")
+            help="指定模組數據源路徑。系統會自動掃描該目錄下所有符合 --include 的子資料夾 (預設 mod_ 開頭)。")
+        parser.add_argument(
+            "--include",
+            action="append",
+            default=None,
+            metavar="GLOB",
+            help="視為模組目錄的名稱樣式，可重複指定。預設為 mod_*。")
+        parser.add_argument(
+            "--exclude",
+            action="append",
+            default=None,
+            metavar="GLOB",
+            help="略過 (且不再向下掃描) 的目錄名稱樣式，可重複指定。")
+        parser.add_argument(
+            "--max-depth",
+            type=int,
+            default=1,
+            help="向下搜尋模組目錄的最大深度 (1 代表只看 --input 的直接子目錄，0 代表不限)。")
+        parser.add_argument(
+            "--discovery-threads",
+            type=int,
+            default=16,
+            help="模組探索時平行掃描目錄的執行緒數量。")
         parser.add_argument(
             "--jobs", 
             type=int, 
-            default=cpu_count(), 
+            default=os.cpu_count() or 1, 
             help="平行稽核任務的執行緒數量。預設將使用本機電腦的所有 CPU 核心以實現最高效能。")
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="停用增量稽核快取，所有模組皆重新稽核且不寫入快取。")
+        parser.add_argument(
+            "--rebuild-cache",
+            action="store_true",
+            help="忽略既有快取並重新稽核所有模組，完成後寫入新的快取。")
+        parser.add_argument(
+            "--cache-hash",
+            action="store_true",
+            help="快取指紋額外比對檔案內容雜湊 (較慢，但可偵測大小與修改時間皆未變的編輯)。")
+        parser.add_argument(
+            "--chunksize",
+            type=int,
+            default=0,
+            help="每次派發給 worker 的模組數量。預設 0 代表依模組數與 Jobs 自動計算。")
+        parser.add_argument(
+            "--schedule",
+            choices=["static", "adaptive"],
+            default="static",
+            help="平行稽核的排程方式：static 為固定分塊派發；adaptive 由主程序的 I/O 執行緒預讀檔案、"
+                 "process pool 只做解析比對，最大的模組先送出並依讀取延遲自動調整預讀並行度。")
+        parser.add_argument(
+            "--io-threads",
+            type=int,
+            default=0,
+            help="adaptive 排程的預讀並行度上限。預設 0 代表 Jobs x 4 (最多 64)。")
+        parser.add_argument(
+            "--max-inflight-mb",
+            type=float,
+            default=AuditorConfig.PREFETCH_INFLIGHT_MB,
+            help="adaptive 排程中已預讀但尚未稽核完成的檔案內容上限 (MB)，設為 0 則不限制。")
+        parser.add_argument(
+            "--progress-interval",
+            type=float,
+            default=5.0,
+            help="進度與吞吐量 (模組/秒、預估剩餘時間) 的輸出間隔秒數。")
+        parser.add_argument(
+            "--checkpoint-interval",
+            type=float,
+            default=30.0,
+            help="將已完成結果寫入 output/audit_checkpoint.json 的間隔秒數。")
+        parser.add_argument(
+            "--module-timeout",
+            type=float,
+            default=300.0,
+            help="單一模組稽核的最長秒數，逾時標記為 SYSTEM_ERR。設為 0 則不限制。")
+        parser.add_argument(
+            "--timeout",
+            type=float,
+            default=0,
+            help="整體稽核的最長秒數，逾時後以已完成的模組產生部分報表並以結束碼 1 結束 (使用者中斷為 130)。預設 0 不限制。")
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help="批次向量化模式：以多執行緒讀取所有模組後合併成欄式資料表，一次完成全部比對 (適合上萬個模組)。")
+        parser.add_argument(
+            "--parse-memo",
+            choices=["off", "local", "shared"],
+            default="local",
+            help="解析結果快取：內容相同 (同一樣板產生) 或同一 inode 的 setup.tcl、formal_setup.tcl、JSON、CSV 只解析一次。"
+                 "local 為每個 worker 各自快取，shared 另由主程序的 manager 提供所有 worker 共用的 LRU 表。")
+        parser.add_argument(
+            "--parse-memo-size",
+            type=int,
+            default=AuditorConfig.PARSE_MEMO_ENTRIES,
+            help="解析結果快取的 LRU 筆數上限。")
+        parser.add_argument(
+            "--fail-fast",
+            nargs="?",
+            type=int,
+            const=1,
+            default=0,
+            metavar="N",
+            help="只需通過/不通過判定 (CI 閘門) 時使用：每個模組找到 N 筆違規 (預設 1) 即停止，"
+                 "檢查依成本由低到高執行並依 output/rule_stats.json 的統計調整。結果不寫入快取與歷史紀錄。")
+        parser.add_argument(
+            "--max-failures",
+            type=int,
+            default=0,
+            metavar="N",
+            help="未通過的模組達 N 個即停止整個稽核並輸出部分報表 (不支援 --batch 與 --shard-workers)。"
+                 "設定此項或 --fail-fast 時，有模組未通過則結束碼為 1。")
+        parser.add_argument(
+            "--inproc-threshold",
+            type=int,
+            default=32,
+            help="待稽核模組數低於此值時直接在主程序內執行，不啟動 process pool。")
+        parser.add_argument(
+            "--import-profile",
+            action="store_true",
+            help="輸出模組匯入與各啟動/執行階段的耗時。")
+        parser.add_argument(
+            "--stage-report",
+            default=None,
+            metavar="JSON",
+            help="將各階段耗時 (探索、解析、稽核、工具觸發、報表、CSV) 與開檔數寫成 JSON，供效能基準比對。")
+        parser.add_argument(
+            "--profile",
+            action="store_true",
+            help="以 cProfile 量測每個 worker，結果寫入 output/profile/ 並合併成 merged.prof。")
+        parser.add_argument(
+            "--tool-seats",
+            type=int,
+            default=AuditorConfig.TOOL_MAX_CONCURRENCY,
+            help="同時執行的 EDA 工具子程序上限 (對應 license 座位數)。")
+        parser.add_argument(
+            "--tool-retries",
+            type=int,
+            default=AuditorConfig.TOOL_RETRIES,
+            help="工具啟動失敗或逾時後的重試次數 (指數退避)。")
+        parser.add_argument(
+            "--tool-timeout",
+            action="append",
+            default=[],
+            metavar="TOOL=SECONDS",
+            help="覆寫個別工具的執行逾時秒數，例如 --tool-timeout formality=10，可重複指定。")
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="監看模式：完成首次稽核後常駐，只重新稽核檔案有變動的模組並即時更新報表 (Ctrl-C 結束)。")
+        parser.add_argument(
+            "--watch-backend",
+            choices=["auto", "inotify", "poll"],
+            default="auto",
+            help="檔案變動偵測方式。auto 在 Linux 使用 inotify，不可用時改為輪詢。")
+        parser.add_argument(
+            "--watch-debounce",
+            type=float,
+            default=0.3,
+            help="收到變動後等待的靜止秒數，連續存檔會合併成一次重新稽核。")
+        parser.add_argument(
+            "--watch-poll-interval",
+            type=float,
+            default=1.0,
+            help="輪詢模式下檢查檔案變動的間隔秒數。")
+        parser.add_argument(
+            "--serve-shards",
+            default=None,
+            metavar="HOST:PORT",
+            help="以 shard worker 身分常駐，接收協調者派送的模組並以本機 --jobs 個 process 稽核 (僅限受信任的運算網路；"
+                 "綁定本機以外的位址時必須以環境變數 AUDIT_SHARD_TOKEN 設定驗證 token，協調者端也需設定相同的值)。")
+        parser.add_argument(
+            "--shard-workers",
+            default=None,
+            metavar="HOST:PORT,...",
+            help="分散式模式：將模組依成本切成 shard，派送給這些 shard worker (需共享相同的設計樹路徑)。")
+        parser.add_argument(
+            "--shards",
+            type=int,
+            default=0,
+            help="shard 數量。預設 0 代表 worker 數的 4 倍，讓較快的節點可以多分擔。")
+        parser.add_argument(
+            "--shard-timeout",
+            type=float,
+            default=600.0,
+            help="單一 shard 的最長等待秒數，逾時或連線失敗即改派其他 worker。")
+        parser.add_argument(
+            "--shard-retries",
+            type=int,
+            default=2,
+            help="單一 shard 失敗後重新派送的次數，用盡後該 shard 的模組標記為 SYSTEM_ERR。")
+        parser.add_argument(
+            "--shard-transport",
+            choices=sorted(SHARD_TRANSPORTS),
+            default="tcp",
+            help="shard 的傳輸方式。")
+        parser.add_argument(
+            "--history-db",
+            default=AuditorConfig.HISTORY_DB,
+            help="稽核歷史資料庫 (SQLite)，每次執行的模組結果、違規明細與耗時皆會寫入。")
+        parser.add_argument(
+            "--no-history",
+            action="store_true",
+            help="不寫入稽核歷史資料庫。")
+        parser.add_argument(
+            "--diff-against",
+            type=history_run_ref,
+            default=None,
+            metavar="RUN",
+            help="與指定的歷史執行 (run id 或 last) 比對，只回報新增、修復與變更的違規，並只針對新增的違規發送通知。")
         
-        return parser.parse_args()
+        args = parser.parse_args()
+        # 批次與分散式模式一次送出所有模組，無法在中途依未通過數停止
+        if args.max_failures and (args.batch or args.shard_workers):
+            parser.error("--max-failures 不支援 --batch 與 --shard-workers 模式")
+        # 未設定 token 的 shard worker 會執行任何連線者送來的稽核請求，只允許綁定本機位址
+        if args.serve_shards and not os.environ.get("AUDIT_SHARD_TOKEN") and not is_loopback_host(parse_endpoint(args.serve_shards)[0]):
+            parser.error("--serve-shards 綁定本機以外的位址時必須設定環境變數 AUDIT_SHARD_TOKEN")
+        return args
 
-    def create_dashboard(self, results):
+    @instrumented("create_dashboard")
+    def create_dashboard(self, results, partial_note=None, perf=None, violation_stats=None):
         if not results:
             self.logger.error("無稽核數據，跳過報表生成")
             return
 
-        df = pd.DataFrame(results)
-        df = df.sort_values(by='Module_ID').reset_index(drop=True)
-        df.index = df.index + 1
-
-        total_count = len(df)
-        passed_count = len(df[df['Status'] == AuditorConfig.PASS])
+        # 單次走訪完成統計並決定欄位順序
+        total_count = passed_count = 0
+        columns = {}
+        for r in results:
+            total_count += 1
+            if r['Status'] == AuditorConfig.PASS:
+                passed_count += 1
+            for key in r:
+                columns.setdefault(key, None)
+        columns = list(columns)
         failed_count = total_count - passed_count
         pass_rate = format((passed_count / total_count) * 100, ".1f") if total_count > 0 else "0.0"
         fail_rate = format((failed_count / total_count) * 100, ".1f") if total_count > 0 else "0.0"
 
+        # 明細資料逐列串流寫入 JS 檔 (file:// 直接開啟即可載入)，HTML 只保留外框與分頁程式
+        self._write_dashboard_data(results, columns)
 
-        def apply_status_color(val):
-            bg = '#28a745' if val == AuditorConfig.PASS else '#dc3545'
-            return f'background-color: {bg}; color: white; font-weight: bold; text-align: center;'
+        partial_banner = ""
+        if partial_note:
+            partial_banner = f'<p style="background:#fff3cd; color:#856404; padding:12px; border-radius:8px;"><strong>部分報表：</strong>{partial_note}</p>'
+        perf_section = self._render_perf_section(perf) if perf else ""
+        stats_section = self._render_violation_stats(violation_stats) if violation_stats else ""
+        data_src = os.path.basename(AuditorConfig.REPORT_DATA_JS)
 
-        try:
-            final_styler = df.style.map(apply_status_color, subset=['Status'])
-            html_table = final_styler.to_html(index=True)
-        except Exception as e:
-            self.logger.error(f"HTML 渲染失敗(可能缺少 jinja2): {e}")
-            html_table = df.to_html(index=True) 
-        
         html_template = f"""
         <html><head><meta charset="UTF-8"><style>
             body {{ font-family: 'Helvetica Neue', sans-serif; margin: 50px; background: #f0f2f5; }}
@@ -369,14 +2410,21 @@ class MainAuditorCLI:
             .rate-zone {{ display: flex; flex-direction: row; gap: 15px; flex: 2; align-items: stretch; }}
             .rate-card {{ background: #e8f0fe; padding: 20px; border-radius: 10px; flex: 1; text-align: center; display: flex; flex-direction: column; justify-content: center; }}
             
+            /* 藍框樣式：篩選、排序與分頁控制列 */
+            .controls {{ display: flex; gap: 12px; align-items: center; flex-wrap: wrap; }}
+            .controls input, .controls select, .controls button {{ padding: 8px; border: 1px solid #ccc; border-radius: 6px; }}
+            
             table {{ width: 100%; border-collapse: collapse; margin-top: 20px; }}
-            th {{ background: #1a73e8; color: white; padding: 15px; text-align: center; }}
+            th {{ background: #1a73e8; color: white; padding: 15px; text-align: center; cursor: pointer; }}
             td {{ padding: 12px; border: 1px solid #ddd; }}
             /* 黃框樣式：表格第一欄編號加粗 */
             table td:first-child {{ font-weight: bold; background: #f8f9fa; text-align: center; color: #1a73e8; }}
+            td.status-pass {{ background-color: #28a745; color: white; font-weight: bold; text-align: center; }}
+            td.status-fail {{ background-color: #dc3545; color: white; font-weight: bold; text-align: center; }}
     </style></head><body>
         <div class="container">
                 <h1>Pre-Sign-off Audit System</h1>
+                {partial_banner}
                 <div class="dashboard-header">
                 <!-- 綠框區域 -->
                 <div class="count-zone">
@@ -392,53 +2440,930 @@ class MainAuditorCLI:
                 </div>
             </div>
 
-            {html_table}
+            <!-- 藍框區域 -->
+            <div class="controls">
+                <input id="filter-text" type="search" placeholder="搜尋 Module_ID / Engineer / Issue_Summary" size="40">
+                <select id="filter-status"><option value="">全部狀態</option></select>
+                <select id="page-size"><option>50</option><option selected>100</option><option>500</option></select>
+                <button id="page-prev">上一頁</button>
+                <span id="page-info"></span>
+                <button id="page-next">下一頁</button>
+            </div>
+            <table><thead id="audit-head"></thead><tbody id="audit-body"></tbody></table>
+
+            {stats_section}
+            {perf_section}
             
             <p style="color: #888; margin-top: 30px;">Generated by CAD AutoAudit System at: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
         </div>
+        <script src="{data_src}"></script>
+        <script>{DASHBOARD_SCRIPT}</script>
     </body></html>
     """
         with open(AuditorConfig.REPORT_HTML, 'w', encoding='utf-8') as f:
             f.write(html_template)
 
+    def _write_dashboard_data(self, results, columns):
+        # 欄式表頭 + 每列一個 JSON 陣列，寫檔時不在記憶體組出整份字串
+        with open(AuditorConfig.REPORT_DATA_JS, 'w', encoding='utf-8') as f:
+            f.write(f"window.AUDIT_DATA = {{\"pass\": {json.dumps(AuditorConfig.PASS)}, \"columns\": ")
+            f.write(json.dumps(columns, ensure_ascii=False))
+            f.write(", \"rows\": [")
+            for i, r in enumerate(sorted(results, key=lambda r: r['Module_ID'])):
+                f.write(",\n" if i else "\n")
+                f.write(json.dumps([r.get(c) for c in columns], ensure_ascii=False, default=str))
+            f.write("\n]};\n")
+
+    def _render_violation_stats(self, stats):
+        from html import escape
+        rows = "".join(
+            f"<tr><td>{escape(e['rule_id'])}</td><td>{escape(str(e['severity']))}</td><td>{e['count']}</td><td>{e['modules']}</td></tr>"
+            for e in stats)
+        return f"""
+            <h2 style="color: #1a73e8; margin-top: 40px;">違規類型統計</h2>
+            <table><thead><tr><th>規則</th><th>嚴重度</th><th>違規數</th><th>受影響模組數</th></tr></thead>
+            <tbody>{rows}</tbody></table>"""
+
+    def _render_perf_section(self, perf):
+        from html import escape
+        top_n = AuditorConfig.METRICS_TOP_N
+        module_rows = "".join(
+            f"<tr><td>{escape(m['module'])}</td><td>{m['wall_s'] * 1000:.2f}</td><td>{escape(m['slowest_function'] or '-')}</td></tr>"
+            for m in perf["modules"][:top_n])
+        func_rows = "".join(
+            f"<tr><td>{escape(f['function'])}</td><td>{f['calls']}</td><td>{f['total_s'] * 1000:.2f}</td>"
+            f"<td>{f['mean_ms']:.3f}</td><td>{f['max_ms']:.3f}</td></tr>"
+            for f in self._function_table(perf)[:top_n])
+        return f"""
+            <h2 style="color: #1a73e8; margin-top: 40px;">效能分析：最慢的模組</h2>
+            <table><thead><tr><th>Module_ID</th><th>稽核耗時 (ms)</th><th>最耗時函式</th></tr></thead>
+            <tbody>{module_rows}</tbody></table>
+            <h2 style="color: #1a73e8; margin-top: 40px;">效能分析：最耗時的檢查</h2>
+            <table><thead><tr><th>函式</th><th>呼叫次數</th><th>總耗時 (ms)</th><th>平均 (ms)</th><th>最長 (ms)</th></tr></thead>
+            <tbody>{func_rows}</tbody></table>"""
+
     def run_process(self):
+        self.parse_memo = self._start_parse_memo()
         try:
-            with open(self.args.config, 'r') as f:
-                spec = yaml.safe_load(f)
+            if self.args.serve_shards:
+                ShardWorkerServer(self.args.serve_shards, self.args.jobs, self.logger, self.parse_memo).serve_forever()
+                return
+            ready = False
+            try:
+                ready = self._run_pipeline()
+            finally:
+                if self.args.import_profile:
+                    self._log_phase_profile()
+                if self.args.stage_report:
+                    self._write_stage_report()
+            if ready and self.args.watch:
+                self._run_watch()
+        finally:
+            if self.memo_manager:
+                self.memo_manager.shutdown()
+
+    def _start_parse_memo(self):
+        # 回傳給 worker initializer 的設定；shared 模式另起 manager process 持有共享 LRU 表
+        self.memo_manager = None
+        if self.args.parse_memo == "off":
+            PARSE_MEMO.configure(None)
+            return None
+        conf = {"entries": self.args.parse_memo_size}
+        if self.args.parse_memo == "shared":
+            self.memo_manager, conf["shared"] = start_shared_parse_memo(self.args.parse_memo_size)
+        # 主程序內執行與批次模式直接使用本地快取即可
+        PARSE_MEMO.configure({"entries": self.args.parse_memo_size})
+        return conf
+
+    def _run_pipeline(self):
+        timer = self.timer
+        try:
+            with timer.phase("spec", "載入 Golden Spec (含 yaml)"):
+                import yaml
+                with open(self.args.config, 'r') as f:
+                    spec = yaml.safe_load(f)
+                rules = CompiledAuditRules(spec)
+                self.rules = rules
         except Exception as e:
             self.logger.critical(f"Golden Spec 載入崩潰: {e}")
             return
+        fail_fast = self.args.fail_fast
+        if fail_fast:
+            # 計畫寫在規則物件上，隨 pool initializer 一起送到 worker
+            rules.fail_fast = fail_fast
+            rules.check_order = self._fail_fast_order()
+            self.logger.info(f"fail-fast 模式: 每個模組累積 {fail_fast} 筆違規即停止，檢查順序 {' > '.join(rules.check_order)}")
+            if self.args.batch or self.args.shard_workers:
+                self.logger.warning("批次與分散式模式不支援 --fail-fast，將執行完整稽核")
+
+        # 主程序內執行 (少量模組、監看模式) 也只建立一次稽核環境
+        context = AuditContext(rules, self.logger, self.args.module_timeout)
 
         self.logger.info(f"掃描模組目錄: {self.args.input}")
         if not os.path.exists(self.args.input):
             self.logger.error("錯誤: 指定的輸入路徑不存在。")
             return
 
-        # 使用 List Comprehension 篩選目標資料夾
-        target_dirs = [os.path.join(self.args.input, d) for d in os.listdir(self.args.input) 
-                       if os.path.isdir(os.path.join(self.args.input, d)) and d.startswith("mod_")]
-        
-        self.logger.info(f"偵測到 {len(target_dirs)} 個專案，啟動平行處理執行緒 (Jobs={self.args.jobs})")
-        
-        pool_inputs = [(d, spec) for d in target_dirs]
-        with Pool(processes=self.args.jobs) as p:
-            results = p.map(multiprocessing_worker, pool_inputs)
+        with timer.phase("discovery", "模組探索"):
+            discovery_start = time.time()
+            discovery = ModuleDiscovery(self.args.input, self.logger, include=self.args.include, exclude=self.args.exclude,
+                                        max_depth=self.args.max_depth, threads=self.args.discovery_threads)
+            listings = dict(discovery.discover())
+            target_dirs = list(listings)
+        self.logger.info(f"模組探索完成: 掃描 {discovery.dirs_scanned} 個目錄，找到 {len(target_dirs)} 個模組，耗時 {time.time() - discovery_start:.3f}s")
+
+        # 先比對快取，只有指紋變動的模組才送進稽核
+        cache = None
+        results = []
+        rows_by_dir = {}
+        errors_by_dir = {}
+        fingerprints = {}
+        pending_dirs = []
+        with timer.phase("cache_lookup", "快取比對"):
+            if not self.args.no_cache:
+                cache = AuditResultCache(AuditorConfig.CACHE_FILE, spec, self.logger,
+                                         use_hash=self.args.cache_hash, rebuild=self.args.rebuild_cache)
+            for d in target_dirs:
+                if cache:
+                    fingerprints[d] = cache.fingerprint(d, listings.get(d))
+                    entry = cache.lookup(d, fingerprints[d])
+                    if entry:
+                        # 複本：之後補上的工具欄位不可寫回快取項目
+                        row = dict(entry["result"])
+                        results.append(row)
+                        rows_by_dir[d] = row
+                        errors_by_dir[d] = [Violation.from_tuple(v) for v in entry.get("violations", [])]
+                        continue
+                pending_dirs.append(d)
+        if cache:
+            self.logger.info(f"稽核快取命中 {cache.hits} 個模組，未命中 {cache.misses} 個模組")
+
+        outputs, partial_note = [], None
+        profile_dir = self._prepare_profile_dir() if self.args.profile else None
+        with timer.phase("audit", "稽核"):
+            if pending_dirs and self.args.shard_workers:
+                self.logger.info(f"偵測到 {len(target_dirs)} 個專案，{len(pending_dirs)} 個需重新稽核，使用分散式模式")
+                outputs = self._run_sharded(pending_dirs, spec, listings)
+            elif pending_dirs and self.args.batch:
+                self.logger.info(f"偵測到 {len(target_dirs)} 個專案，{len(pending_dirs)} 個需重新稽核，使用批次向量化模式")
+                with self._profiled(profile_dir):
+                    outputs = self._run_batch(pending_dirs, rules, listings)
+            elif pending_dirs and (len(pending_dirs) < self.args.inproc_threshold or self.args.jobs <= 1):
+                self.logger.info(f"偵測到 {len(target_dirs)} 個專案，{len(pending_dirs)} 個需重新稽核，於主程序內直接執行")
+                with self._profiled(profile_dir):
+                    outputs, partial_note = self._run_in_process(pending_dirs, context, listings, results)
+            elif pending_dirs and self.args.schedule == "adaptive":
+                self.logger.info(f"偵測到 {len(target_dirs)} 個專案，{len(pending_dirs)} 個需重新稽核，使用自適應排程 (Jobs={self.args.jobs})")
+                outputs, partial_note = self._run_adaptive_pool(pending_dirs, rules, listings, results, cache, fingerprints, target_dirs, profile_dir)
+            elif pending_dirs:
+                self.logger.info(f"偵測到 {len(target_dirs)} 個專案，{len(pending_dirs)} 個需重新稽核，啟動平行處理執行緒 (Jobs={self.args.jobs})")
+                outputs, partial_note = self._run_streaming_pool(pending_dirs, rules, listings, results, cache, fingerprints, target_dirs, profile_dir)
+        self._finalize_outputs(outputs)
+        for out in outputs:
+            rows_by_dir[out["dir"]] = out["row"]
+            errors_by_dir[out["dir"]] = out["violations"]
+        if fail_fast:
+            # 統計只供 fail-fast 排序使用，完整稽核不必每次改寫
+            self._update_rule_stats(outputs)
+        if fail_fast or self.args.max_failures:
+            # CI 閘門：有任何模組未通過 (含快取命中的結果) 即以結束碼 1 回報
+            self.exit_code = int(any(row["Status"] != AuditorConfig.PASS for row in rows_by_dir.values()))
+        if partial_note:
+            # 未完整結束的稽核不可被腳本或 CI 視為通過：使用者中斷為 130，其餘 (整體逾時、未通過數達上限) 為 1
+            self.exit_code = 130 if self.interrupted else 1
+        if fail_fast:
+            # 只稽核到第一批違規的結果不完整，不寫入快取與歷史紀錄
+            self.logger.warning("fail-fast 模式的違規數僅為提前停止前找到的部分，結果不寫入快取與歷史紀錄")
+            cache = None
+
+        history, run_id, regressions = None, None, None
+        if not self.args.no_history and not fail_fast:
+            with timer.phase("history", "歷史紀錄寫入與比對"):
+                history, run_id, regressions = self._record_history(spec, outputs, rows_by_dir, errors_by_dir, partial_note)
+
+        with timer.phase("notify", "失敗通知"):
+            self._send_notifications(outputs, regressions)
+        if partial_note:
+            self.logger.warning("稽核未完整結束，略過 EDA 工具啟動階段")
+        else:
+            with timer.phase("tool_trigger", "EDA 工具啟動"):
+                # results 此時只有快取命中的模組
+                self._launch_tools(results + [out["row"] for out in outputs])
+
+        with timer.phase("cache_store", "快取與檢查點寫入"):
+            for out in outputs:
+                results.append(out["row"])
+                rows_by_dir[out["dir"]] = out["row"]
+                if cache and out["row"]["Status"] != AuditorConfig.SYSTEM_ERROR:
+                    cache.store(out["dir"], fingerprints[out["dir"]], out["row"], out["violations"])
+            if cache:
+                cache.save(target_dirs)
+            self._write_checkpoint(results, len(target_dirs), complete=partial_note is None)
+        self._log_io_summary(outputs)
+        perf = self._collect_metrics(outputs)
+
+        with timer.phase("import_pandas", "載入 pandas"):
+            import pandas
+        violation_stats = self._violation_stats(errors_by_dir)
+        self.write_reports(results, partial_note, perf, violation_stats)
+        self._report_metrics(perf)
+        if history:
+            history.record_timings(run_id, self.timer.as_dict(), time.perf_counter() - _STARTUP_T0)
+            history.close()
+        if profile_dir:
+            self._merge_profiles(profile_dir)
+        self.run_summary.update({"modules": len(target_dirs), "audited": len(outputs), "cache_hits": cache.hits if cache else 0})
+        if partial_note:
+            return False
+        # 監看模式沿用已編譯的規則、探索結果與快取
+        self.watch_state = {"rules": rules, "context": context, "discovery": discovery, "listings": listings,
+                            "rows_by_dir": rows_by_dir, "cache": cache, "fingerprints": fingerprints}
+        return True
 
-        self.create_dashboard(results)
+    def _run_watch(self):
+        state = self.watch_state
+        rules, discovery, listings = state["rules"], state["discovery"], state["listings"]
+        args = self.args
+        try:
+            watcher = create_tree_watcher(self.logger, args.watch_backend, args.watch_poll_interval)
+            watcher.reset(discovery.tree_dirs, listings)
+        except OSError as e:
+            self.logger.warning(f"inotify 監看建立失敗，改用輪詢: {e}")
+            watcher = PollingTreeWatcher(self.logger, args.watch_poll_interval)
+            watcher.reset(discovery.tree_dirs, listings)
+
+        # worker pool 在整個監看期間保持常駐，變動時不必重新啟動與載入規則
+        pool = listener = None
+        if args.jobs > 1:
+            from multiprocessing import Pool
+            log_queue, listener = start_log_listener(self.logger)
+            pool = Pool(processes=args.jobs, initializer=init_pool_worker,
+                        initargs=(log_queue, rules, args.module_timeout, None, self.parse_memo))
+        self.logger.info(f"監看模式啟動 ({type(watcher).__name__})：{len(listings)} 個模組，按 Ctrl-C 結束")
+        try:
+            while True:
+                dirty, rescan = watcher.poll(1.0)
+                if not dirty and not rescan:
+                    continue
+                # debounce：持續收到事件就延後，直到靜止 --watch-debounce 秒 (最多延後 10 倍)
+                first = last = time.time()
+                while time.time() - last < args.watch_debounce and time.time() - first < args.watch_debounce * 10:
+                    more, more_rescan = watcher.poll(args.watch_debounce)
+                    if more or more_rescan:
+                        dirty |= more
+                        rescan = rescan or more_rescan
+                        last = time.time()
+                self._watch_cycle(watcher, pool, dirty, rescan)
+        except KeyboardInterrupt:
+            self.logger.info("監看模式結束")
+        finally:
+            watcher.close()
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+                listener.stop()
+
+    def _watch_cycle(self, watcher, pool, dirty, rescan):
+        state = self.watch_state
+        discovery, listings, rows_by_dir = state["discovery"], state["listings"], state["rows_by_dir"]
+        cache, fingerprints = state["cache"], state["fingerprints"]
+        start = time.perf_counter()
+        if rescan:
+            found = dict(discovery.discover())
+            for d in set(listings) - set(found):
+                rows_by_dir.pop(d, None)
+                self.logger.info(f"模組已移除: {d}")
+            dirty |= set(found) - set(listings)
+            listings.clear()
+            listings.update(found)
+            watcher.reset(discovery.tree_dirs, listings)
+        dirty = sorted(d for d in dirty if d in listings)
+        # 變動的模組重新讀取目錄清單 (可能新增或刪除了檔案)
+        for d in dirty:
+            listings[d] = discovery.list_module(d)[1]
+
+        tasks = [(d, listings[d]) for d in dirty]
+        if pool is not None and len(tasks) > 1:
+            outputs = pool.map(multiprocessing_worker, tasks)
+        elif pool is not None and tasks:
+            outputs = [pool.apply(multiprocessing_worker, (tasks[0],))]
+        else:
+            outputs = [run_module_audit(*task, state["context"]) for task in tasks]
+        self._finalize_outputs(outputs)
+
+        self._send_notifications(outputs)
+        self._launch_tools([out["row"] for out in outputs])
+        for out in outputs:
+            rows_by_dir[out["dir"]] = out["row"]
+            if cache and out["row"]["Status"] != AuditorConfig.SYSTEM_ERROR:
+                fingerprints[out["dir"]] = cache.fingerprint(out["dir"], listings[out["dir"]])
+                cache.store(out["dir"], fingerprints[out["dir"]], out["row"], out["violations"])
+        if cache:
+            cache.save(list(listings))
+        self.write_reports(list(rows_by_dir.values()))
+        for out in outputs:
+            row = out["row"]
+            self.logger.info(f"模組 {row['Module_ID']}: {row['Status']} ({row['Total_Issues']} 項問題)")
+        self.logger.info(f"監看模式: 重新稽核 {len(outputs)} 個模組並更新報表，耗時 {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    def _write_stage_report(self):
+        # 供 benchmark.py 等工具比對的機器可讀階段耗時
+        report = dict(self.run_summary)
+        report["jobs"] = self.args.jobs
+        report["stages"] = {k: round(v, 6) for k, v in self.timer.as_dict().items()}
+        report["total_s"] = round(time.perf_counter() - _STARTUP_T0, 6)
+        try:
+            with open(self.args.stage_report, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            self.logger.error(f"階段耗時報告寫入失敗: {e}")
+
+    def _log_phase_profile(self):
+        total = time.perf_counter() - _STARTUP_T0
+        self.logger.info("啟動與執行階段耗時 (--import-profile):")
+        for _, name, seconds in self.timer.phases:
+            self.logger.info(f"  {name:<24s} {seconds * 1000:9.1f} ms")
+        self.logger.info(f"  {'總計 (自模組載入起)':<24s} {total * 1000:9.1f} ms")
+
+    def _run_in_process(self, pending_dirs, context, listings, cached_rows=()):
+        # 少量模組直接在主程序執行，省去 pool 啟動與序列化成本
+        outputs, partial_note = [], None
+        clock = {}
+        try:
+            for d in pending_dirs:
+                outputs.append(run_module_audit(d, listings.get(d), context))
+                partial_note = self._failure_limit_note(clock, outputs, cached_rows)
+                if partial_note:
+                    self.logger.warning(partial_note)
+                    break
+        except KeyboardInterrupt:
+            self.interrupted = True
+            partial_note = f"稽核被使用者中斷，僅包含已完成的 {len(outputs)} 個模組"
+            self.logger.warning(partial_note)
+        return outputs, partial_note
+
+    def _run_sharded(self, pending_dirs, spec, listings):
+        args = self.args
+        endpoints = [e.strip() for e in args.shard_workers.split(",") if e.strip()]
+        start = time.time()
+        shards = plan_shards(pending_dirs, listings, args.shards or len(endpoints) * 4)
+        loads = [cost for _, cost in shards]
+        self.logger.info(f"切分為 {len(shards)} 個 shard 派送至 {len(endpoints)} 個 worker，"
+                         f"估計成本最大/最小 {max(loads) / 1024:.0f}/{min(loads) / 1024:.0f} KB")
+        transport = SHARD_TRANSPORTS[args.shard_transport](args.shard_timeout)
+        coordinator = ShardCoordinator(transport, endpoints, spec, self.logger,
+                                       retries=args.shard_retries, module_timeout=args.module_timeout)
+        outputs = coordinator.run(shards, listings)
+        elapsed = time.time() - start
+        self.logger.info(f"分散式稽核完成: {len(outputs)} 個模組，耗時 {elapsed:.2f}s ({len(outputs) / max(elapsed, 1e-9):.1f} 模組/秒)")
+        return outputs
+
+    def _run_batch(self, pending_dirs, rules, listings):
+        start = time.time()
+        engine = BatchAuditEngine(rules, self.logger, io_threads=self.args.jobs * 4, module_timeout=self.args.module_timeout)
+        outputs = engine.run(pending_dirs, listings)
+        elapsed = time.time() - start
+        self.logger.info(f"批次向量化稽核完成: {len(outputs)} 個模組，耗時 {elapsed:.2f}s ({len(outputs) / max(elapsed, 1e-9):.1f} 模組/秒)")
+        return outputs
+
+    def _run_streaming_pool(self, pending_dirs, rules, listings, cached_rows, cache, fingerprints, target_dirs, profile_dir=None):
+        args = self.args
+        total = len(pending_dirs)
+        chunksize = args.chunksize or max(1, min(32, total // (args.jobs * 8)))
+        tasks = [(d, listings.get(d)) for d in pending_dirs]
+        # 自行分塊後以 chunksize=1 派發，才能逐塊取回並在等待時設定 timeout
+        batches = [tasks[i:i + chunksize] for i in range(0, total, chunksize)]
+        # 在所有其他模組完成後，若仍有模組超過此時間無回應，視為卡死 (例如 NFS 無回應)
+        stall_limit = args.module_timeout * 2 + AuditorConfig.STALL_GRACE_S if args.module_timeout else 0
+        deadline = time.time() + args.timeout if args.timeout else 0
+
+        outputs = []
+        partial_note = None
+        clock = dict.fromkeys(("start", "last_progress", "last_report", "last_checkpoint"), time.time())
+        from multiprocessing import Pool, TimeoutError as PoolTimeoutError
+        log_queue, listener = start_log_listener(self.logger)
+        pool = Pool(processes=args.jobs, initializer=init_pool_worker, initargs=(log_queue, rules, args.module_timeout, profile_dir, self.parse_memo))
+        try:
+            stream = pool.imap_unordered(multiprocessing_batch_worker, batches)
+            while len(outputs) < total:
+                try:
+                    outputs.extend(stream.next(timeout=min(1.0, args.progress_interval)))
+                    clock["last_progress"] = time.time()
+                except PoolTimeoutError:
+                    pass
+                stop, partial_note = self._pool_tick(clock, outputs, pending_dirs, cached_rows, cache, fingerprints, target_dirs, deadline, stall_limit)
+                if stop:
+                    break
+        except KeyboardInterrupt:
+            self.interrupted = True
+            partial_note = f"稽核被使用者中斷，僅包含已完成的 {len(cached_rows) + len(outputs)} 個模組"
+        finally:
+            if len(outputs) < total or partial_note or clock.get("stalled"):
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+            listener.stop()
+
+        if partial_note:
+            self.logger.warning(f"{partial_note}，尚有 {total - len(outputs)} 個模組未完成")
+        else:
+            self._log_progress(len(outputs), total, time.time() - clock["start"])
+        return outputs, partial_note
+
+    def _pool_tick(self, clock, outputs, pending_dirs, cached_rows, cache, fingerprints, target_dirs, deadline, stall_limit):
+        # pool 排程共用的等待迴圈檢查：整體逾時、卡死偵測、進度輸出與定期檢查點；回傳 (是否停止, 部分結果說明)
+        args = self.args
+        note = self._failure_limit_note(clock, outputs, cached_rows)
+        if note:
+            return True, note
+        now = time.time()
+        if deadline and now > deadline:
+            return True, f"整體稽核逾時 ({args.timeout}s)，僅包含已完成的 {len(cached_rows) + len(outputs)} 個模組"
+        if stall_limit and now - clock["last_progress"] > stall_limit:
+            done_dirs = {o["dir"] for o in outputs}
+            stuck = [d for d in pending_dirs if d not in done_dirs]
+            self.logger.error(f"{len(stuck)} 個模組超過 {stall_limit:.0f}s 無回應，標記為系統錯誤")
+            outputs.extend(build_system_error_output(d, f"稽核無回應 (>{stall_limit:.0f}s)") for d in stuck)
+            # 卡住的 worker 不會自行結束，pool 必須 terminate 而非 close/join
+            clock["stalled"] = True
+            return True, None
+        if now - clock["last_report"] >= args.progress_interval:
+            self._log_progress(len(outputs), len(pending_dirs), now - clock["start"])
+            clock["last_report"] = now
+        if now - clock["last_checkpoint"] >= args.checkpoint_interval:
+            self._checkpoint(cached_rows, outputs, cache, fingerprints, target_dirs)
+            clock["last_checkpoint"] = now
+        return False, None
+
+    def _failure_limit_note(self, clock, outputs, cached_rows):
+        # --max-failures：未通過的模組 (含快取命中) 達上限即停止整個稽核；只計算上次檢查後新增的結果
+        limit = self.args.max_failures
+        if not limit:
+            return None
+        if "failures" not in clock:
+            clock["failures"] = sum(row["Status"] != AuditorConfig.PASS for row in cached_rows)
+            clock["counted"] = 0
+        for i in range(clock["counted"], len(outputs)):
+            if clock["failures"] >= limit:
+                # 同一批取回的結果中超過上限的部分捨棄，報表內的未通過模組數恰為上限
+                del outputs[i:]
+                break
+            clock["failures"] += outputs[i]["row"]["Status"] != AuditorConfig.PASS
+        clock["counted"] = len(outputs)
+        if clock["failures"] < limit:
+            return None
+        return f"未通過的模組達上限 ({limit})，提前結束，僅包含已完成的 {len(cached_rows) + len(outputs)} 個模組"
+
+    def _load_rule_stats(self):
+        try:
+            with open(AuditorConfig.RULE_STATS_JSON, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"檢查單元統計讀取失敗，改用預設順序: {e}")
+            return {}
+
+    def _fail_fast_order(self):
+        checks = self._load_rule_stats().get("checks", {})
+        if any(checks.get(c, {}).get("runs", 0) < AuditorConfig.RULE_STATS_MIN_RUNS for c in FAIL_FAST_CHECK_ORDER):
+            return FAIL_FAST_CHECK_ORDER
+        # 找到第一筆違規的期望成本最低：依 平均耗時 / 命中機率 由小到大 (命中率以 Laplace 平滑，避免從未命中的單元除以 0)
+        def score(check):
+            entry = checks[check]
+            return (entry["seconds"] / entry["runs"]) / ((entry["hits"] + 1) / (entry["runs"] + 2))
+        return tuple(sorted(FAIL_FAST_CHECK_ORDER, key=score))
+
+    def _update_rule_stats(self, outputs):
+        audited = [out for out in outputs if "checks" in out]
+        if not audited:
+            return
+        stats = self._load_rule_stats()
+        checks = stats.setdefault("checks", {})
+        for out in audited:
+            funcs = out.get("perf", {}).get("funcs", {})
+            for check in out["checks"]["ran"]:
+                entry = checks.setdefault(check, {"runs": 0, "hits": 0, "seconds": 0.0})
+                entry["runs"] += 1
+                entry["seconds"] += funcs.get(f"check_{check}", (0, 0.0))[1]
+            for check in out["checks"]["hit"]:
+                checks[check]["hits"] += 1
+        for entry in checks.values():
+            entry["hit_rate"] = round(entry["hits"] / entry["runs"], 4) if entry["runs"] else 0.0
+            entry["avg_ms"] = round(entry["seconds"] / entry["runs"] * 1000, 4) if entry["runs"] else 0.0
+        stats["updated"] = datetime.now().isoformat(timespec="seconds")
+        tmp_path = f"{AuditorConfig.RULE_STATS_JSON}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, AuditorConfig.RULE_STATS_JSON)
+        except Exception as e:
+            self.logger.error(f"檢查單元統計寫入失敗: {e}")
+
+    def _run_adaptive_pool(self, pending_dirs, rules, listings, cached_rows, cache, fingerprints, target_dirs, profile_dir=None):
+        # 主程序以執行緒預讀檔案 (I/O)，process pool 只負責解析與比對 (CPU)；最大的模組先送出
+        args = self.args
+        total = len(pending_dirs)
+        costs = {d: estimate_module_cost(d, listings.get(d)) for d in pending_dirs}
+        order = sorted(pending_dirs, key=lambda d: -costs[d])
+        io_limit = args.io_threads or min(64, args.jobs * 4)
+        concurrency = AdaptiveConcurrency(args.jobs * 2, maximum=io_limit)
+        byte_cap = int(args.max_inflight_mb * 1024 * 1024)
+        # 已預讀完成、等待 worker 的模組數上限，避免預讀遠遠跑在運算前面
+        queue_limit = args.jobs * 4
+        stall_limit = args.module_timeout * 2 + AuditorConfig.STALL_GRACE_S if args.module_timeout else 0
+        deadline = time.time() + args.timeout if args.timeout else 0
+
+        events = queue.Queue()
+        outputs = []
+        partial_note = None
+        charged = {}
+        inflight_bytes = prefetched_bytes = reading = queued = next_idx = 0
+        clock = dict.fromkeys(("start", "last_progress", "last_report", "last_checkpoint"), time.time())
+
+        # 預讀逾時 (例如卡住的 NFS 或 FIFO) 的模組直接標記為系統錯誤；讀取執行緒為 daemon，卡住也不會阻擋程式結束
+        read_started = {}
+        abandoned = set()
+
+        def prefetch(d):
+            files, nbytes, elapsed = prefetch_module_files(d, listings.get(d))
+            events.put(("read", d, files, nbytes, elapsed))
+
+        from multiprocessing import Pool
+        log_queue, listener = start_log_listener(self.logger)
+        pool = Pool(processes=args.jobs, initializer=init_pool_worker, initargs=(log_queue, rules, args.module_timeout, profile_dir, self.parse_memo))
+        try:
+            while len(outputs) < total:
+                # 在並行度、等待佇列與預讀記憶體上限內持續送出讀取 (至少保留一個模組在途，避免單一大模組卡住)
+                while (next_idx < total and reading < concurrency.limit and queued < queue_limit
+                       and (not byte_cap or inflight_bytes == 0 or inflight_bytes + costs[order[next_idx]] <= byte_cap)):
+                    d = order[next_idx]
+                    next_idx += 1
+                    charged[d] = costs[d]
+                    inflight_bytes += costs[d]
+                    reading += 1
+                    read_started[d] = time.time()
+                    threading.Thread(target=prefetch, args=(d,), daemon=True).start()
+                batch_events = []
+                try:
+                    batch_events.append(events.get(timeout=min(1.0, args.progress_interval)))
+                    while True:
+                        batch_events.append(events.get_nowait())
+                except queue.Empty:
+                    pass
+                if args.module_timeout:
+                    now = time.time()
+                    for d in [d for d, t in read_started.items() if now - t > args.module_timeout]:
+                        del read_started[d]
+                        abandoned.add(d)
+                        reading -= 1
+                        inflight_bytes -= charged.pop(d)
+                        self.logger.error(f"模組 {os.path.basename(d)}: 預讀逾時 (>{args.module_timeout}s)，標記為系統錯誤")
+                        outputs.append(build_system_error_output(d, f"預讀逾時 (>{args.module_timeout}s)"))
+                        clock["last_progress"] = now
+                # 同一輪已預讀完成的模組合併成一個任務派發，負載高時自然形成較大的批次
+                ready = []
+                for event in batch_events:
+                    if event[0] == "read":
+                        _, d, files, nbytes, elapsed = event
+                        if d in abandoned:
+                            continue
+                        del read_started[d]
+                        reading -= 1
+                        queued += 1
+                        prefetched_bytes += nbytes
+                        if files:
+                            concurrency.observe(elapsed / len(files))
+                        # 以實際預讀量取代估計值 (大型網表不預讀)
+                        inflight_bytes += nbytes - charged[d]
+                        charged[d] = nbytes
+                        ready.append((d, listings.get(d), files))
+                    else:
+                        for out in event[1]:
+                            queued -= 1
+                            inflight_bytes -= charged.pop(out["dir"])
+                            outputs.append(out)
+                        clock["last_progress"] = time.time()
+                for i in range(0, len(ready), queue_limit // 2 or 1):
+                    chunk = ready[i:i + (queue_limit // 2 or 1)]
+                    pool.apply_async(multiprocessing_batch_worker, (chunk,), callback=lambda outs: events.put(("done", outs)),
+                                     error_callback=lambda e, chunk=chunk: events.put(
+                                         ("done", [build_system_error_output(t[0], f"稽核異常: {e}") for t in chunk])))
+                stop, partial_note = self._pool_tick(clock, outputs, pending_dirs, cached_rows, cache, fingerprints, target_dirs, deadline, stall_limit)
+                if stop:
+                    break
+        except KeyboardInterrupt:
+            self.interrupted = True
+            partial_note = f"稽核被使用者中斷，僅包含已完成的 {len(cached_rows) + len(outputs)} 個模組"
+        finally:
+            if len(outputs) < total or partial_note or clock.get("stalled"):
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+            listener.stop()
+
+        elapsed = time.time() - clock["start"]
+        self.run_summary["scheduler"] = {"io_concurrency": concurrency.limit, "io_concurrency_peak": concurrency.peak,
+                                         "io_backoffs": concurrency.decreases, "prefetched_mb": round(prefetched_bytes / 1048576, 2)}
+        self.logger.info(f"自適應排程: 預讀並行度 {concurrency.limit} (最高 {concurrency.peak}，減半 {concurrency.decreases} 次)，"
+                         f"預讀 {prefetched_bytes / 1048576:.1f} MB，平均每檔讀取 {(concurrency.ewma or 0) * 1000:.2f} ms")
+        if partial_note:
+            self.logger.warning(f"{partial_note}，尚有 {total - len(outputs)} 個模組未完成")
+        else:
+            self._log_progress(len(outputs), total, elapsed)
+        return outputs, partial_note
+
+    def _finalize_outputs(self, outputs):
+        # 輸出端才把結構化違規格式化成 Issue_Summary (報表、CSV、快取與檢查點共用)
+        for out in outputs:
+            if "Issue_Summary" not in out["row"]:
+                out["row"]["Issue_Summary"] = self.rules.issue_summary(out["violations"])
+
+    def _violation_stats(self, violations_by_dir):
+        # 依規則代號彙總違規數與受影響模組數，不需解析訊息字串
+        stats = {}
+        for violations in violations_by_dir.values():
+            seen = set()
+            for v in violations:
+                entry = stats.setdefault(v.rule_id, {"rule_id": v.rule_id, "severity": v.severity, "count": 0, "modules": 0})
+                entry["count"] += 1
+                if v.rule_id not in seen:
+                    entry["modules"] += 1
+                    seen.add(v.rule_id)
+        ranked = sorted(stats.values(), key=lambda e: (-e["count"], e["rule_id"]))
+        if ranked:
+            self.logger.info("違規類型統計: " + ", ".join(f"{e['rule_id']}={e['count']}" for e in ranked))
+        return ranked
+
+    def _send_notifications(self, outputs, regressions=None):
+        trigger = AuditActionTrigger(self.logger, self.rules)
+        for out in outputs:
+            row = out["row"]
+            if row["Status"] != AuditorConfig.FAIL:
+                continue
+            violations = out["violations"]
+            # 比對模式下只通知相對基準新增的違規
+            if regressions is not None:
+                wanted = regressions.get(self._module_path(out["dir"]), ())
+                violations = [v for v in violations if v.key() in wanted]
+            if violations:
+                trigger.queue_notification(row["Module_ID"], row["Engineer"], violations)
+        trigger.flush_notifications()
+
+    def _module_path(self, mod_dir):
+        return os.path.relpath(mod_dir, self.args.input).replace(os.sep, "/")
+
+    def _record_history(self, spec, outputs, rows_by_dir, errors_by_dir, partial_note):
+        # 本次所有模組 (含快取命中) 的結果寫入歷史資料庫，必要時與基準執行比對
+        wall = {out["dir"]: out.get("perf", {}).get("wall_s") for out in outputs}
+        records = [(self._module_path(d), row, errors_by_dir.get(d, []), wall.get(d)) for d, row in rows_by_dir.items()]
+        try:
+            history = AuditHistoryStore(self.args.history_db, self.logger)
+            run_id = history.record_run(AuditResultCache.digest_spec(spec), records, partial_note, self.rules)
+        except Exception as e:
+            self.logger.error(f"稽核歷史寫入失敗: {e}")
+            return None, None, None
+        self.logger.info(f"稽核歷史已寫入 {self.args.history_db} (run {run_id})")
+        if self.args.diff_against is None:
+            return history, run_id, None
+        base_run = history.resolve_run(self.args.diff_against, run_id)
+        if base_run is None:
+            self.logger.warning(f"找不到比對基準 {self.args.diff_against}，改為通知所有失敗模組")
+            return history, run_id, None
+        diff = history.diff(base_run, run_id)
+        self._report_diff(diff)
+        return history, run_id, AuditHistoryStore.regressions(diff)
+
+    def _report_diff(self, diff):
+        self.logger.info(f"與 run {diff['baseline_run']} 比對: 新增違規 {len(diff['new'])} 項、修復 {len(diff['fixed'])} 項、"
+                         f"變更 {len(diff['changed'])} 項，新增模組 {len(diff['added_modules'])} 個、移除模組 {len(diff['removed_modules'])} 個")
+        for item in diff["new"]:
+            self.logger.warning(f"  [新增] {item['module']} ({item['engineer']}): {item['message']}")
+        for item in diff["changed"]:
+            self.logger.warning(f"  [變更] {item['module']} ({item['path']}): {' | '.join(item['before'])} -> {' | '.join(item['after'])}")
+        for item in diff["fixed"]:
+            self.logger.info(f"  [修復] {item['module']}: {item['message']}")
+        try:
+            with open(AuditorConfig.DIFF_JSON, 'w', encoding='utf-8') as f:
+                json.dump(diff, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            self.logger.error(f"比對結果寫入失敗: {e}")
+
+    def _parse_tool_timeouts(self):
+        timeouts = {}
+        for item in self.args.tool_timeout:
+            name, _, value = item.partition("=")
+            try:
+                timeouts[name.strip()] = float(value)
+            except ValueError:
+                self.logger.error(f"忽略無效的工具逾時設定: {item}")
+        return timeouts
+
+    def _launch_tools(self, rows):
+        passed = [row["Module_ID"] for row in rows if row["Status"] == AuditorConfig.PASS]
+        launcher = EdaToolLauncher(self.logger, max_concurrency=self.args.tool_seats,
+                                   retries=self.args.tool_retries, timeouts=self._parse_tool_timeouts())
+        self.logger.info(f"啟動 EDA 工具階段: {len(passed)} 個模組，同時執行上限 {launcher.max_concurrency}")
+        try:
+            records = launcher.launch_all(passed)
+        except KeyboardInterrupt:
+            self.logger.warning("EDA 工具啟動階段被使用者中斷")
+            records = {}
+        for row in rows:
+            tool_records = records.get(row["Module_ID"], {})
+            row["Tool_Exit"] = ", ".join(f"{t}={r['exit_status']}" for t, r in tool_records.items())
+            row["Tool_Latency_s"] = round(sum(r["latency"] for r in tool_records.values()), 3) if tool_records else ""
+        launched = [r for recs in records.values() for r in recs.values()]
+        if launched:
+            failures = sum(1 for r in launched if r["exit_status"] != 0)
+            avg_latency = sum(r["latency"] for r in launched) / len(launched)
+            self.logger.info(f"EDA 工具啟動完成: 共 {len(launched)} 次，失敗 {failures} 次，平均延遲 {avg_latency:.3f}s")
+
+    def _log_io_summary(self, outputs):
+        io_stats = [o["io"] for o in outputs if "io" in o]
+        if not io_stats:
+            return
+        opens = sum(io["opens"] for io in io_stats)
+        stats = sum(io["stats"] for io in io_stats)
+        self.run_summary.update({"files_opened": opens, "dir_reads": stats,
+                                 "parse_s": round(sum(io.get("load_s", 0.0) for io in io_stats), 6)})
+        self.logger.info(f"檔案 I/O 統計: 開檔 {opens} 次、目錄查詢 {stats} 次 (平均每模組 {opens / len(io_stats):.1f} / {stats / len(io_stats):.1f})")
+        memo = {}
+        for io_count in io_stats:
+            for source, n in io_count.get("memo", {}).items():
+                memo[source] = memo.get(source, 0) + n
+        lookups = sum(memo.values())
+        if lookups:
+            hits = lookups - memo.get("parsed", 0)
+            self.run_summary["parse_memo"] = memo
+            self.logger.info(f"解析快取命中率 {hits / lookups:.1%} ({hits}/{lookups}): inode {memo.get('inode', 0)}、"
+                             f"內容雜湊 {memo.get('content', 0)}、共享表 {memo.get('shared', 0) + memo.get('shared_inode', 0)}、"
+                             f"實際解析 {memo.get('parsed', 0)}")
+        if self.parse_memo and self.parse_memo.get("shared") is not None:
+            table = self.parse_memo["shared"].stats()
+            self.logger.info(f"共享解析表: {table['entries']} 筆，LRU 淘汰 {table['evictions']} 筆")
+
+    def _collect_metrics(self, outputs):
+        # 各模組回傳的量測合併成全域統計，並依模組稽核耗時排序
+        module_funcs, modules = {}, []
+        for out in outputs:
+            perf = out.get("perf")
+            if not perf:
+                continue
+            funcs = perf["funcs"]
+            FunctionMetrics.merge(module_funcs, funcs)
+            slowest = max(funcs, key=lambda name: funcs[name][1]) if funcs else None
+            modules.append({"module": out["row"]["Module_ID"], "status": out["row"]["Status"],
+                            "wall_s": perf["wall_s"], "slowest_function": slowest, "functions": funcs})
+        modules.sort(key=lambda m: m["wall_s"], reverse=True)
+        return {"module_funcs": module_funcs, "modules": modules}
+
+    def _function_table(self, perf):
+        # 模組內的量測再加上主程序自身的部分 (工具啟動、報表、批次比對)
+        table = FunctionMetrics.merge(FunctionMetrics.merge({}, perf["module_funcs"]), FUNCTION_METRICS.totals)
+        rows = [{"function": name, "calls": calls, "total_s": round(seconds, 6),
+                 "mean_ms": round(seconds / calls * 1000, 4), "max_ms": round(peak * 1000, 4)}
+                for name, (calls, seconds, peak) in table.items()]
+        rows.sort(key=lambda r: r["total_s"], reverse=True)
+        return rows
+
+    def _report_metrics(self, perf):
+        functions = self._function_table(perf)
+        modules = perf["modules"]
+        top_n = AuditorConfig.METRICS_TOP_N
+        if functions:
+            self.logger.info("函式耗時統計 (依總耗時排序):")
+            for f in functions:
+                self.logger.info(f"  {f['function']:<28s} 呼叫 {f['calls']:>7d} 次，總計 {f['total_s'] * 1000:10.1f} ms，"
+                                 f"平均 {f['mean_ms']:8.3f} ms，最長 {f['max_ms']:8.3f} ms")
+        if modules:
+            slowest = ", ".join(f"{m['module']}({m['wall_s'] * 1000:.1f}ms)" for m in modules[:top_n])
+            self.logger.info(f"最慢的 {min(top_n, len(modules))} 個模組: {slowest}")
+
+        data = {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "audited_modules": len(modules),
+            "module_wall_s_total": round(sum(m["wall_s"] for m in modules), 6),
+            "functions": functions,
+            "slowest_modules": [{"module": m["module"], "status": m["status"], "wall_s": round(m["wall_s"], 6),
+                                 "slowest_function": m["slowest_function"]} for m in modules[:top_n]],
+            "per_module": {m["module"]: {"wall_s": round(m["wall_s"], 6),
+                                         "functions": {name: {"calls": c, "total_s": round(t, 6)} for name, (c, t, _) in m["functions"].items()}}
+                           for m in modules}}
+        try:
+            with open(AuditorConfig.METRICS_JSON, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            with open(AuditorConfig.METRICS_PROM, 'w', encoding='utf-8') as f:
+                f.write(self._format_prometheus(functions, modules))
+        except Exception as e:
+            self.logger.error(f"效能量測檔寫入失敗: {e}")
+
+    def _format_prometheus(self, functions, modules):
+        # Prometheus text exposition 格式，可由 node_exporter textfile collector 收集
+        lines = []
+        def metric(name, mtype, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {mtype}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value}")
+        label = lambda f: '{function="%s"}' % f["function"]
+        metric("audit_function_calls_total", "counter", "受測函式的呼叫次數", [(label(f), f["calls"]) for f in functions])
+        metric("audit_function_seconds_total", "counter", "受測函式的累計耗時 (秒)", [(label(f), f["total_s"]) for f in functions])
+        metric("audit_function_max_seconds", "gauge", "受測函式單次呼叫的最長耗時 (秒)", [(label(f), f["max_ms"] / 1000) for f in functions])
+        metric("audit_modules_audited", "gauge", "本次實際稽核的模組數", [("", len(modules))])
+        metric("audit_module_seconds_sum", "counter", "所有模組稽核耗時總和 (秒)", [("", round(sum(m["wall_s"] for m in modules), 6))])
+        metric("audit_module_seconds_max", "gauge", "單一模組稽核的最長耗時 (秒)", [("", round(modules[0]["wall_s"], 6) if modules else 0)])
+        return "\n".join(lines) + "\n"
+
+    def _prepare_profile_dir(self):
+        profile_dir = AuditorConfig.PROFILE_DIR
+        os.makedirs(profile_dir, exist_ok=True)
+        # 清除上次執行留下的 worker 結果，避免合併到舊資料
+        for name in os.listdir(profile_dir):
+            if name.startswith("worker_") and name.endswith(".prof"):
+                os.remove(os.path.join(profile_dir, name))
+        return profile_dir
+
+    @contextmanager
+    def _profiled(self, profile_dir):
+        # 主程序內執行的稽核 (少量模組或批次模式) 與 worker 使用相同的量測方式
+        if profile_dir:
+            start_worker_profiler(profile_dir)
+        try:
+            yield
+        finally:
+            if profile_dir:
+                dump_worker_profile(profile_dir)
+
+    def _merge_profiles(self, profile_dir):
+        import io
+        import pstats
+        files = sorted(os.path.join(profile_dir, n) for n in os.listdir(profile_dir)
+                       if n.startswith("worker_") and n.endswith(".prof"))
+        if not files:
+            self.logger.warning("找不到任何 worker 的 cProfile 結果 (稽核可能被中斷)")
+            return
+        buf = io.StringIO()
+        stats = pstats.Stats(files[0], stream=buf)
+        for path in files[1:]:
+            stats.add(path)
+        merged_path = os.path.join(profile_dir, "merged.prof")
+        stats.dump_stats(merged_path)
+        stats.sort_stats("cumulative").print_stats(20)
+        self.logger.info(f"已合併 {len(files)} 份 cProfile 結果: {merged_path}\n{buf.getvalue()}")
+
+    def _log_progress(self, done, total, elapsed):
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else float('inf')
+        eta_text = f"{eta:.0f}s" if eta != float('inf') else "N/A"
+        self.logger.info(f"稽核進度 {done}/{total} ({done / total * 100:.1f}%)，吞吐量 {rate:.1f} 模組/秒，預估剩餘 {eta_text}")
+
+    def _checkpoint(self, cached_rows, outputs, cache, fingerprints, target_dirs):
+        self._finalize_outputs(outputs)
+        if self.args.fail_fast:
+            cache = None
+        for out in outputs:
+            if cache and out["row"]["Status"] != AuditorConfig.SYSTEM_ERROR:
+                cache.store(out["dir"], fingerprints[out["dir"]], out["row"], out["violations"])
+        if cache:
+            cache.save(target_dirs)
+        self._write_checkpoint(cached_rows + [o["row"] for o in outputs], len(target_dirs), complete=False)
+
+    def _write_checkpoint(self, rows, total, complete):
+        data = {"complete": complete, "total": total, "finished": len(rows), "results": rows}
+        tmp_path = f"{AuditorConfig.CHECKPOINT_FILE}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, AuditorConfig.CHECKPOINT_FILE)
+        except Exception as e:
+            self.logger.error(f"檢查點寫入失敗: {e}")
+
+    def write_reports(self, results, partial_note=None, perf=None, violation_stats=None):
+        import pandas as pd
+        with self.timer.phase("dashboard", "HTML 報表輸出"):
+            self.create_dashboard(results, partial_note, perf, violation_stats)
         
-        failed_results = [r for r in results if r['Status'] == AuditorConfig.FAIL]
-        error_df = pd.DataFrame(failed_results)
+        with self.timer.phase("csv", "錯誤清單輸出"):
+            failed_results = [r for r in results if r['Status'] != AuditorConfig.PASS]
+            error_df = pd.DataFrame(failed_results)
 
-        if not error_df.empty:
-            error_df = error_df.sort_values(by='Module_ID', ascending=True)
-            error_df = error_df.drop(columns=['Status'])
+            if not error_df.empty:
+                error_df = error_df.sort_values(by='Module_ID', ascending=True)
+                error_df = error_df.drop(columns=['Status', 'Tool_Exit', 'Tool_Latency_s'], errors='ignore')
 
-        error_df.to_csv(AuditorConfig.ERROR_CSV, index=False)
-        self.logger.info(f"任務完成。報表：{AuditorConfig.REPORT_HTML}，錯誤清單：{AuditorConfig.ERROR_CSV}")
+            error_df.to_csv(AuditorConfig.ERROR_CSV, index=False)
+        if partial_note:
+            self.logger.warning(f"已輸出部分報表。報表：{AuditorConfig.REPORT_HTML}，錯誤清單：{AuditorConfig.ERROR_CSV}")
+        else:
+            self.logger.info(f"任務完成。報表：{AuditorConfig.REPORT_HTML}，錯誤清單：{AuditorConfig.ERROR_CSV}")
 
 if __name__ == "__main__":
     start_watch = time.time()
     Auditor = MainAuditorCLI()
     Auditor.run_process()
     stop_watch = round(time.time() - start_watch, 4)
-    print(f"\n[SYSTEM] 稽核引擎總運行耗時: {stop_watch}s")
\ No newline at end of file
+    print(f"\n[SYSTEM] 稽核引擎總運行耗時: {stop_watch}s")
+    sys.exit(Auditor.exit_code)
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDITOR = os.path.join(REPO_DIR, "main_auditor.py")
+GENERATOR = os.path.join(REPO_DIR, "gen_data.py")
+sys.path.insert(0, REPO_DIR)
+
+
+def run_auditor(workdir, *args, timeout=120, hash_seed=0):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    return subprocess.run([sys.executable, AUDITOR, *args], cwd=workdir, env=env,
+                          capture_output=True, text=True, timeout=timeout)
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    # 小型模擬專案：生成資料並放置 Formality 模擬執行檔
+    def build(modules=12, depth=0):
+        subprocess.run([sys.executable, GENERATOR, "--modules", str(modules), "--seed", "0", "--depth", str(depth)],
+                       cwd=tmp_path, check=True, stdout=subprocess.DEVNULL)
+        tool = tmp_path / "bin" / "formality"
+        tool.write_text('#!/bin/bash\necho "Formality Mock Tool: Verified $2"\n')
+        tool.chmod(0o755)
+        return tmp_path
+    return build
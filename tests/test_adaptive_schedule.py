@@ -0,0 +1,54 @@
+import os
+import csv
+import threading
+
+from conftest import run_auditor
+
+ADAPTIVE_ARGS = ["--schedule", "adaptive", "--jobs", "2", "--inproc-threshold", "0", "--no-cache", "--no-history"]
+
+
+def read_violations(ws):
+    with open(ws / "output" / "violation_list.csv", newline="", encoding="utf-8") as f:
+        return {row["Module_ID"]: row for row in csv.DictReader(f)}
+
+
+def replace_with_fifo(path):
+    content = path.read_bytes()
+    path.unlink()
+    os.mkfifo(path)
+    return content
+
+
+def test_idle_gap_does_not_replay_events(workspace):
+    # 一個模組的預讀延遲超過事件等待時間，期間的空轉輪次不得重複處理上一批事件
+    ws = workspace(modules=12)
+    fifo = ws / "input_data" / "mod_003" / "setup.tcl"
+    content = replace_with_fifo(fifo)
+
+    def release():
+        with open(fifo, "wb") as f:
+            f.write(content)
+
+    timer = threading.Timer(2.5, release)
+    timer.start()
+    try:
+        result = run_auditor(ws, *ADAPTIVE_ARGS, "--progress-interval", "0.2", "--module-timeout", "30")
+    finally:
+        timer.cancel()
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr
+    trace = (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+    assert "稽核進度 12/12" in trace
+    assert "預讀逾時" not in read_violations(ws).get("mod_003", {}).get("Issue_Summary", "")
+
+
+def test_stuck_prefetch_is_marked_system_error(workspace):
+    # 永遠讀不完的檔案：該模組在逾時後標記為系統錯誤，其餘模組照常完成，程式也能正常結束
+    ws = workspace(modules=12)
+    replace_with_fifo(ws / "input_data" / "mod_005" / "project_status.json")
+    result = run_auditor(ws, *ADAPTIVE_ARGS, "--module-timeout", "1", timeout=60)
+    assert result.returncode == 0, result.stderr
+    rows = read_violations(ws)
+    assert "預讀逾時" in rows["mod_005"]["Issue_Summary"]
+    trace = (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+    assert "稽核進度 12/12" in trace
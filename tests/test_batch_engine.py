@@ -0,0 +1,32 @@
+import os
+import csv
+
+from conftest import run_auditor
+
+
+def test_stuck_read_is_marked_system_error(workspace):
+    # 批次模式下讀不完的檔案：該模組逾時後標記為系統錯誤，其餘模組照常稽核
+    ws = workspace(modules=8)
+    fifo = ws / "input_data" / "mod_004" / "tool_info.csv"
+    fifo.unlink()
+    os.mkfifo(fifo)
+    result = run_auditor(ws, "--batch", "--no-cache", "--no-history", "--module-timeout", "1", timeout=60)
+    assert result.returncode == 0, result.stderr
+    with open(ws / "output" / "violation_list.csv", newline="", encoding="utf-8") as f:
+        rows = {row["Module_ID"]: row for row in csv.DictReader(f)}
+    assert "讀取逾時" in rows["mod_004"]["Issue_Summary"]
+    trace = (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+    assert "批次向量化稽核完成: 8 個模組" in trace
+
+
+def test_read_error_is_marked_system_error(workspace):
+    # 單一模組讀取異常 (JSON 不是物件) 只標記該模組，不中斷整個批次稽核
+    ws = workspace(modules=8)
+    (ws / "input_data" / "mod_002" / "project_status.json").write_text("[1, 2]")
+    result = run_auditor(ws, "--batch", "--no-cache", "--no-history")
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr
+    with open(ws / "output" / "violation_list.csv", newline="", encoding="utf-8") as f:
+        rows = {row["Module_ID"]: row for row in csv.DictReader(f)}
+    assert "稽核異常" in rows["mod_002"]["Issue_Summary"]
+    assert (ws / "output" / "final_report.html").exists()
@@ -0,0 +1,34 @@
+import csv
+
+from conftest import run_auditor
+
+
+def test_rule_stats_written_only_for_fail_fast(workspace):
+    # 完整稽核不改寫檢查單元統計，fail-fast 執行才累積
+    ws = workspace(modules=12)
+    stats = ws / "output" / "rule_stats.json"
+    result = run_auditor(ws, "--no-cache", "--no-history")
+    assert result.returncode == 0, result.stderr
+    assert not stats.exists()
+    result = run_auditor(ws, "--no-cache", "--no-history", "--fail-fast")
+    assert result.returncode == 1, result.stderr
+    assert stats.exists()
+
+
+def test_max_failures_rejected_in_batch_and_sharded_modes(workspace):
+    ws = workspace(modules=4)
+    for mode in (["--batch"], ["--shard-workers", "127.0.0.1:9"]):
+        result = run_auditor(ws, *mode, "--max-failures", "2")
+        assert result.returncode == 2
+        assert "--max-failures" in result.stderr
+
+
+def test_max_failures_caps_reported_failures(workspace):
+    # 以大區塊取回結果時，報表中的未通過模組數仍不超過上限
+    ws = workspace(modules=40)
+    for schedule in ("static", "adaptive"):
+        result = run_auditor(ws, "--no-cache", "--no-history", "--jobs", "2", "--inproc-threshold", "0",
+                             "--chunksize", "10", "--schedule", schedule, "--max-failures", "5")
+        assert result.returncode == 1, result.stderr
+        with open(ws / "output" / "violation_list.csv", newline="", encoding="utf-8") as f:
+            assert len(list(csv.DictReader(f))) == 5, schedule
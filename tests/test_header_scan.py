@@ -0,0 +1,57 @@
+import gzip
+import logging
+
+from main_auditor import AuditorConfig, FileParsingEngine
+
+CHUNK = AuditorConfig.HEADER_CHUNK_SIZE
+
+
+def parser(**kwargs):
+    return FileParsingEngine(logging.getLogger("test"), **kwargs)
+
+
+def netlist(prefix_len, header):
+    # 以註解填充，讓表頭落在指定的位元組位置
+    return b"/" * prefix_len + b"\n" + header
+
+
+def test_fields_straddling_chunk_boundary(tmp_path):
+    # 日期跨越區塊邊界、模組名稱在邊界處被截斷時，都必須取得完整值
+    head = netlist(CHUNK - 25, b"// Generated on: 2024-03-15\n")
+    head += b"/" * (2 * CHUNK - len(head) - 12) + b"\nmodule long_module_name (a, b);\n"
+    path = tmp_path / "straddle.v"
+    path.write_bytes(head)
+    date_at = head.index(b"2024-03-15")
+    assert date_at < CHUNK < date_at + 10
+    name_at = head.index(b"long_module_name")
+    assert name_at < 2 * CHUNK < name_at + len(b"long_module_name")
+    info = parser().parse_verilog_header(str(path))
+    assert info["date"] == "2024-03-15"
+    assert info["module"] == "long_module_name"
+
+
+def test_gzip_netlist(tmp_path):
+    data = netlist(CHUNK + 100, b"// Generated on: 2023-12-01\nmodule gz_top (clk);\n")
+    path = tmp_path / "top.v.gz"
+    path.write_bytes(gzip.compress(data))
+    engine = parser()
+    info = engine.parse_verilog_header(str(path))
+    assert (info["date"], info["module"]) == ("2023-12-01", "gz_top")
+    # 主程序預讀的壓縮內容也走相同的解壓掃描
+    prefetched = engine.parse_verilog_header(str(path), path.read_bytes())
+    assert (prefetched["date"], prefetched["module"]) == ("2023-12-01", "gz_top")
+
+
+def test_byte_budget_exhausted(tmp_path):
+    path = tmp_path / "late.v"
+    path.write_bytes(netlist(3 * CHUNK, b"// Generated on: 2024-01-01\nmodule late (a);\n"))
+    info = parser(scan_bytes=CHUNK).parse_verilog_header(str(path))
+    assert (info["date"], info["module"]) == ("NOT_FOUND", "NOT_FOUND")
+    assert parser().parse_verilog_header(str(path))["module"] == "late"
+
+
+def test_line_budget_exhausted(tmp_path):
+    path = tmp_path / "lines.v"
+    path.write_bytes(b"//\n" * CHUNK + b"// Generated on: 2024-01-01\nmodule late (a);\n")
+    info = parser(scan_lines=100).parse_verilog_header(str(path))
+    assert (info["date"], info["module"]) == ("NOT_FOUND", "NOT_FOUND")
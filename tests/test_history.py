@@ -0,0 +1,63 @@
+import json
+import shutil
+import sqlite3
+
+from conftest import run_auditor
+
+HISTORY_ARGS = ["--no-cache", "--diff-against", "last"]
+
+
+def load_diff(ws):
+    return json.loads((ws / "output" / "audit_diff.json").read_text(encoding="utf-8"))
+
+
+def mail_log_size(ws):
+    path = ws / "output" / "mail_sent.log"
+    return path.stat().st_size if path.exists() else 0
+
+
+def test_same_input_gives_empty_diff(workspace):
+    # 輸入不變時比對結果必須為空，也不得再寄出回歸通知；兩次執行的集合迭代順序刻意不同
+    ws = workspace(modules=60)
+    first = run_auditor(ws, *HISTORY_ARGS, hash_seed=1)
+    assert first.returncode == 0, first.stderr
+    sent = mail_log_size(ws)
+    second = run_auditor(ws, *HISTORY_ARGS, hash_seed=2)
+    assert second.returncode == 0, second.stderr
+    diff = load_diff(ws)
+    assert diff["baseline_run"] == 1 and diff["current_run"] == 2
+    for kind in ("new", "fixed", "changed", "added_modules", "removed_modules"):
+        assert diff[kind] == [], kind
+    assert mail_log_size(ws) == sent
+
+
+def test_duplicate_basenames_are_kept_apart(workspace):
+    # 巢狀目錄下兩個同名模組各自寫入歷史，比對也以路徑區分
+    ws = workspace(modules=12, depth=1)
+    source = ws / "input_data" / "lvl0_00" / "mod_001"
+    copy = ws / "input_data" / "lvl0_01" / "mod_001"
+    shutil.copytree(source, copy)
+    result = run_auditor(ws, *HISTORY_ARGS, "--max-depth", "2")
+    assert result.returncode == 0, result.stderr
+    conn = sqlite3.connect(ws / "output" / "audit_history.db")
+    paths = sorted(r[0] for r in conn.execute("SELECT module_path FROM modules WHERE run_id = 1 AND module_id = 'mod_001'"))
+    assert paths == ["lvl0_00/mod_001", "lvl0_01/mod_001"]
+    assert conn.execute("SELECT COUNT(*) FROM modules WHERE run_id = 1").fetchone()[0] == 13
+    conn.close()
+
+    (copy / "setup.tcl").unlink()
+    result = run_auditor(ws, *HISTORY_ARGS, "--max-depth", "2")
+    assert result.returncode == 0, result.stderr
+    diff = load_diff(ws)
+    touched = {item["path"] for item in diff["new"] + diff["changed"]}
+    assert touched == {"lvl0_01/mod_001"}
+    assert diff["fixed"] == []
+
+
+def test_invalid_diff_reference_is_rejected(workspace):
+    # 無效的比對基準在參數解析時即拒絕，不會寫入歷史後才崩潰
+    ws = workspace(modules=4)
+    result = run_auditor(ws, "--no-cache", "--diff-against", "foo")
+    assert result.returncode == 2
+    assert "--diff-against" in result.stderr
+    assert not (ws / "output" / "audit_history.db").exists()
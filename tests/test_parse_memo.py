@@ -0,0 +1,38 @@
+import logging
+
+from main_auditor import PARSE_MEMO, FileParsingEngine, compile_tcl_patterns, TCL_FIELD_TEMPLATES
+
+SCRIPT = b"set PDK_VER v3.1\nset LIBS /libs/N7/v1.2/std /libs/N5/v2.0/std\n"
+
+
+def make_parser(process):
+    patterns, list_fields = compile_tcl_patterns(TCL_FIELD_TEMPLATES, process)
+    return FileParsingEngine(logging.getLogger("test"), tcl_patterns=patterns, tcl_list_fields=list_fields)
+
+
+def test_memo_is_keyed_by_tcl_patterns():
+    # 兩份 spec 的製程不同：內容相同的腳本不得沿用另一組樣式的擷取結果
+    PARSE_MEMO.configure({})
+    try:
+        n7, n5 = make_parser("N7"), make_parser("N5")
+        assert n7.tcl_memo_kind != n5.tcl_memo_kind
+        assert n7.tcl_field(n7.parse_tcl_settings("a.tcl", SCRIPT), "libs") == ["v1.2"]
+        assert n5.tcl_field(n5.parse_tcl_settings("b.tcl", SCRIPT), "libs") == ["v2.0"]
+        assert make_parser("N7").tcl_memo_kind == n7.tcl_memo_kind
+    finally:
+        PARSE_MEMO.configure(None)
+
+
+def test_tcl_fields_are_extracted_on_demand(tmp_path):
+    # 只擷取被查詢的欄位，同一欄位只跑一次 regex
+    path = tmp_path / "setup.tcl"
+    path.write_bytes(SCRIPT)
+    parser = make_parser("N7")
+    calls = []
+    original = parser.extract_tcl_field
+    parser.extract_tcl_field = lambda content, field: calls.append(field) or original(content, field)
+    settings = parser.parse_tcl_settings(str(path))
+    assert calls == []
+    assert parser.tcl_field(settings, "pdk_ver") == "v3.1"
+    assert parser.tcl_field(settings, "pdk_ver") == "v3.1"
+    assert calls == ["pdk_ver"]
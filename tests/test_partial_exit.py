@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+import signal
+import subprocess
+
+from conftest import AUDITOR, run_auditor
+
+POOL_ARGS = ["--jobs", "2", "--inproc-threshold", "0", "--no-cache", "--no-history"]
+
+
+def test_overall_timeout_exits_non_zero(workspace):
+    # 整體逾時只產生部分報表，結束碼不得為 0
+    ws = workspace(modules=12)
+    fifo = ws / "input_data" / "mod_006" / "setup.tcl"
+    fifo.unlink()
+    os.mkfifo(fifo)
+    result = run_auditor(ws, *POOL_ARGS, "--module-timeout", "0", "--timeout", "2", timeout=60)
+    assert result.returncode == 1, result.stderr
+    assert "整體稽核逾時" in (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+
+
+def test_interrupt_exits_130(workspace):
+    ws = workspace(modules=12)
+    fifo = ws / "input_data" / "mod_006" / "setup.tcl"
+    fifo.unlink()
+    os.mkfifo(fifo)
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    proc = subprocess.Popen([sys.executable, AUDITOR, *POOL_ARGS, "--module-timeout", "0"], cwd=ws, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    trace = ws / "output" / "audit_trace.log"
+    deadline = time.time() + 30
+    while time.time() < deadline and "稽核進度" not in (trace.read_text(encoding="utf-8") if trace.exists() else ""):
+        time.sleep(0.2)
+    proc.send_signal(signal.SIGINT)
+    assert proc.wait(timeout=60) == 130
+    assert "稽核被使用者中斷" in trace.read_text(encoding="utf-8")
@@ -0,0 +1,26 @@
+import json
+
+from conftest import run_auditor
+
+
+def checkpoint_rows(ws):
+    data = json.loads((ws / "output" / "audit_checkpoint.json").read_text(encoding="utf-8"))
+    return {row["Module_ID"]: row for row in data["results"]}
+
+
+def test_cache_hits_relaunch_tools(workspace):
+    # 快取命中只沿用稽核結果，工具結束碼必須來自本次執行
+    ws = workspace(modules=12)
+    first = run_auditor(ws, "--no-history")
+    assert first.returncode == 0, first.stderr
+    passed = [m for m, row in checkpoint_rows(ws).items() if row["Status"] == "PASS"]
+    assert passed and all(checkpoint_rows(ws)[m]["Tool_Exit"] == "formality=0" for m in passed)
+
+    (ws / "bin" / "formality").write_text("#!/bin/bash\nexit 3\n")
+    second = run_auditor(ws, "--no-history", "--tool-retries", "0")
+    assert second.returncode == 0, second.stderr
+    assert "稽核快取命中 12 個模組" in (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+    rows = checkpoint_rows(ws)
+    assert all(rows[m]["Tool_Exit"] == "formality=3" for m in passed)
+    cache = json.loads((ws / "output" / "audit_cache.json").read_text(encoding="utf-8"))
+    assert all("Tool_Exit" not in entry["result"] for entry in cache["entries"].values())
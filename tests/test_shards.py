@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import socket
+import subprocess
+
+from conftest import AUDITOR, run_auditor
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise AssertionError(f"shard worker 未於 {timeout}s 內啟動")
+
+
+def test_shards_reassigned_from_dead_worker(workspace, tmp_path, monkeypatch):
+    # 一個可用的 worker 加上一個無人監聽的端點：失敗的 shard 改派到可用的 worker，合併結果與本機模式相同
+    monkeypatch.delenv("AUDIT_SHARD_TOKEN", raising=False)
+    ws = workspace(modules=24)
+    local = run_auditor(ws, "--no-cache", "--no-history")
+    assert local.returncode == 0, local.stderr
+    expected = (ws / "output" / "violation_list.csv").read_bytes()
+
+    server_dir = tmp_path / "srv"
+    server_dir.mkdir()
+    port, dead = free_port(), free_port()
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    server = subprocess.Popen([sys.executable, AUDITOR, "--serve-shards", f"127.0.0.1:{port}", "--jobs", "2"],
+                              cwd=server_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(port)
+        result = run_auditor(ws, "--no-cache", "--no-history", "--shard-workers", f"127.0.0.1:{port},127.0.0.1:{dead}",
+                             "--shard-timeout", "30")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    assert result.returncode == 0, result.stderr
+    trace = (ws / "output" / "audit_trace.log").read_text(encoding="utf-8")
+    assert f"127.0.0.1:{dead} 失敗" in trace and "重新派送" in trace
+    assert "分散式稽核失敗" not in trace
+    assert (ws / "output" / "violation_list.csv").read_bytes() == expected
+
+
+def test_non_loopback_bind_requires_token(workspace, monkeypatch):
+    monkeypatch.delenv("AUDIT_SHARD_TOKEN", raising=False)
+    ws = workspace(modules=4)
+    result = run_auditor(ws, "--serve-shards", "0.0.0.0:0")
+    assert result.returncode == 2
+    assert "AUDIT_SHARD_TOKEN" in result.stderr
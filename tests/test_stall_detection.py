@@ -0,0 +1,40 @@
+import os
+import csv
+import sys
+import subprocess
+
+import pytest
+
+from conftest import REPO_DIR
+
+# 模擬無法中斷的讀取 (例如卡住的 NFS)：SIGALRM 不再觸發模組逾時，worker 會一直卡在 FIFO 上；
+# 自適應排程的預讀改由 worker 自行讀檔，卡死的位置才會在 worker 內
+WRAPPER = """
+import sys, signal
+sys.path.insert(0, {repo!r})
+import main_auditor
+_signal = signal.signal
+signal.signal = lambda signum, handler: _signal(signum, (lambda *a: None) if signum == signal.SIGALRM else handler)
+main_auditor.AuditorConfig.STALL_GRACE_S = 1
+main_auditor.prefetch_module_files = lambda d, listing, *args, **kwargs: ({{}}, 0, 0.0)
+sys.argv = ["main_auditor.py"] + sys.argv[1:]
+auditor = main_auditor.MainAuditorCLI()
+auditor.run_process()
+sys.exit(auditor.exit_code)
+"""
+
+
+@pytest.mark.parametrize("schedule", ["static", "adaptive"])
+def test_stalled_worker_is_terminated(workspace, schedule):
+    ws = workspace(modules=8)
+    fifo = ws / "input_data" / "mod_003" / "setup.tcl"
+    fifo.unlink()
+    os.mkfifo(fifo)
+    env = dict(os.environ, PYTHONHASHSEED="0")
+    result = subprocess.run([sys.executable, "-c", WRAPPER.format(repo=REPO_DIR), "--schedule", schedule,
+                             "--jobs", "2", "--inproc-threshold", "0", "--no-cache", "--no-history", "--module-timeout", "1"],
+                            cwd=ws, env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    with open(ws / "output" / "violation_list.csv", newline="", encoding="utf-8") as f:
+        rows = {row["Module_ID"]: row for row in csv.DictReader(f)}
+    assert "稽核無回應" in rows["mod_003"]["Issue_Summary"]